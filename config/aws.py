@@ -0,0 +1,24 @@
+# config/aws.py
+from botocore.config import Config
+
+# Shared botocore configuration for all AWS clients.
+# The pool is sized above the worker thread pools so concurrent records
+# don't queue for a connection, and keepalive avoids repeated TCP/TLS setup.
+# botocore's 60s default timeouts exceed the 10s Lambda timeout; with these
+# values a call stalled on every attempt gives up after 3 * (1 + 2) = 9s of
+# socket time instead of killing the invocation.
+boto_config = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=2,
+    retries={"mode": "standard", "max_attempts": 3}
+)
+
+# DynamoDB throttles per partition under webhook bursts, so allow one more
+# attempt; single-item calls answer in milliseconds, so a 1s read timeout
+# keeps the worst case at 4 * (1 + 1) = 8s.
+dynamodb_config = boto_config.merge(Config(
+    read_timeout=1,
+    retries={"mode": "standard", "max_attempts": 4}
+))
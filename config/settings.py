@@ -20,6 +20,15 @@ class Settings(BaseSettings):
     # Secrets
     WEBHOOK_TOKEN: str
     QUALIA_API_TOKEN: str
+    # Send Automatic Persisted Query hashes instead of full GraphQL documents
+    QUALIA_PERSISTED_QUERIES: bool = False
+    # Send get_order/get_orders as GET so HTTP caches and ETag revalidation apply
+    QUALIA_GET_READS: bool = False
+    # Open a pooled connection to Qualia in the background when the client is created
+    QUALIA_WARMUP: bool = False
+    # Seconds to serve repeated get_order/get_orders results from memory; 0 disables the cache.
+    # Kept short: changes made on Qualia's side or by other instances aren't seen until expiry
+    QUALIA_READ_CACHE_TTL: float = 5
     INTERNAL_API_TOKEN: str
     INTERNAL_API_URL: str
 
@@ -28,6 +37,11 @@ class Settings(BaseSettings):
     DYNAMODB_TABLE: str = f"qualia-orders-{os.getenv('STAGE', 'dev')}"
     DOWNLOAD_QUEUE_URL: str
     PROCESSING_QUEUE_URL: str
+    # Seconds to serve repeated message lookups from memory; 0 disables the cache
+    MESSAGE_CACHE_TTL: float = 15
+
+    # Set to false to forward fulfill-title-search forms without model validation
+    VALIDATE_INBOUND: bool = True
 
     model_config = {
         "env_file": ".env",
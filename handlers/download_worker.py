@@ -1,53 +1,100 @@
 # handlers/download_worker.py
-import json
 import logging
-from datetime import datetime
-from services.qualia_client import QualiaClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from models.queue_message import DownloadJob
+from services.qualia_client import get_qualia_client
 from services.s3_service import upload_raw_payload
-from services.dynamodb_service import put_metadata
-from services.sqs_service import send_to_processing_queue
+from services.dynamodb_service import batch_put_metadata
+from services.sqs_service import send_batch_to_processing_queue
+from utils.timeutils import now_iso
 
 logger = logging.getLogger(__name__)
 
-def handle_download_event(event):
-    """Lambda handler for downloading orders from Qualia API."""
-    logger.info(f"Processing {len(event.get('Records', []))} download records")
+# Records are independent and I/O-bound, so fan them out across threads
+_executor = ThreadPoolExecutor(max_workers=10)
+
+def _process_record(record):
+    """Download a single order and store it, returning its processing message."""
+    # Parse and validate the envelope in one pass
+    job = DownloadJob.model_validate_json(record["body"])
+    order_id = job.order_id
+    # Shared structured-log fields for this record
+    log_extra = {"order_id": order_id}
+
+    logger.info("Starting download for order %s", order_id, extra=log_extra)
 
-    for record in event.get("Records", []):
-        body = json.loads(record["body"])
-        order_id = body["order_id"]
+    try:
+        # 1. Download from Qualia API
+        client = get_qualia_client()
+        payload = client.download_order(order_id)
 
-        logger.info(f"Starting download for order {order_id}", extra={
-            "order_id": order_id
+        # 2. Store to S3
+        s3_key, checksum = upload_raw_payload(order_id, payload)
+
+        logger.info("Successfully completed download for order %s", order_id, extra={
+            **log_extra,
+            "s3_key": s3_key
         })
 
-        try:
-            # 1. Download from Qualia API
-            client = QualiaClient()
-            payload = client.download_order(order_id)
+        # 3. DOWNLOADED status and 4. processing message are written in batches by the handler
+        return {
+            "message_id": record["messageId"],
+            "order_id": order_id,
+            "s3_key": s3_key,
+            "checksum": checksum,
+            "downloaded_at": now_iso()
+        }
 
-            # 2. Store to S3
-            s3_key, checksum = upload_raw_payload(order_id, payload)
+    except Exception as e:
+        logger.error("Download failed for order %s: %s", order_id, e, extra={
+            **log_extra,
+            "error": str(e)
+        }, exc_info=True)
+        raise
 
-            # 3. Update DB with DOWNLOADED status
-            put_metadata(order_id, "DOWNLOADED", {
-                "s3_key": s3_key,
-                "checksum": checksum,
-                "downloaded_at": datetime.utcnow().isoformat() + "Z"
-            })
+def handle_download_event(event):
+    """Lambda handler for downloading orders from Qualia API.
 
-            # 4. Queue for processing stage
-            send_to_processing_queue(order_id, s3_key, checksum)
+    Returns a partial batch response so SQS only retries the failed records.
+    """
+    records = event.get("Records", [])
+    logger.info("Processing %s download records", len(records))
+    processing_messages = []
+    failed_message_ids = []
 
-            logger.info(f"Successfully completed download for order {order_id}", extra={
-                "order_id": order_id,
-                "s3_key": s3_key
-            })
+    futures = {_executor.submit(_process_record, record): record for record in records}
+    for future in as_completed(futures):
+        try:
+            processing_messages.append(future.result())
+        except Exception:
+            # Let SQS retry this record
+            failed_message_ids.append(futures[future]["messageId"])
 
+    if processing_messages:
+        # Record DOWNLOADED before queueing so the processing stage never races it
+        try:
+            batch_put_metadata([{
+                "order_id": m["order_id"],
+                "status": "DOWNLOADED",
+                "extra": {
+                    "s3_key": m["s3_key"],
+                    "checksum": m["checksum"],
+                    "downloaded_at": m["downloaded_at"]
+                }
+            } for m in processing_messages])
         except Exception as e:
-            logger.error(f"Download failed for order {order_id}: {str(e)}", extra={
-                "order_id": order_id,
+            logger.error("Failed to record DOWNLOADED status: %s", e, extra={
                 "error": str(e)
             }, exc_info=True)
-            # Let SQS retry
-            raise
\ No newline at end of file
+            failed_message_ids.extend(m["message_id"] for m in processing_messages)
+            processing_messages = []
+
+    if processing_messages:
+        failed_orders = set(send_batch_to_processing_queue(processing_messages))
+        failed_message_ids.extend(
+            m["message_id"] for m in processing_messages if m["order_id"] in failed_orders
+        )
+
+    return {
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids]
+    }
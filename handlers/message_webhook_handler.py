@@ -1,20 +1,37 @@
 # handlers/message_webhook_handler.py
+import base64
+import orjson
+import time
 import uuid
 import logging
-from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
 from models.message_webhook import QualiaActivityNotification
-from services.dynamodb_service import store_activity
-from services.qualia_client import QualiaClient
+from services.dynamodb_service import store_activity, store_activity_with_message
 from utils.auth import verify_webhook_auth
+from utils.request_body import json_body, json_body_openapi
+from utils.timeutils import now_iso
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("")
+# (messages_list response, index by message_id) for the last list we indexed
+_messages_index = (None, {})
+
+def _messages_by_id(client, force: bool = False) -> dict:
+    """Return the current messages list indexed by message_id; force bypasses the client's cache."""
+    global _messages_index
+    messages_response = client.get_messages_list(force=force)
+    if messages_response is not _messages_index[0]:
+        messages = (messages_response or {}).get("messages") or []
+        _messages_index = (messages_response, {m.get("message_id"): m for m in messages})
+    return _messages_index[1]
+
+@router.post("", openapi_extra=json_body_openapi(QualiaActivityNotification))
 async def receive_activity_webhook(
-    notification: QualiaActivityNotification,
-    auth = Depends(verify_webhook_auth)
+    auth = Depends(verify_webhook_auth),
+    notification: QualiaActivityNotification = Depends(json_body(QualiaActivityNotification))
 ):
     """Receive activity webhook notification from Qualia Marketplace.
 
@@ -30,9 +47,9 @@ async def receive_activity_webhook(
     from the Qualia API and store them in DynamoDB.
     """
     request_id = str(uuid.uuid4())[:8]
-    start = datetime.now(timezone.utc)
+    start = time.perf_counter()
 
-    logger.info(f"Received {notification.type} activity for order {notification.order_id}", extra={
+    logger.info("Received %s activity for order %s", notification.type, notification.order_id, extra={
         "order_id": notification.order_id,
         "activity_type": notification.type,
         "request_id": request_id,
@@ -41,6 +58,10 @@ async def receive_activity_webhook(
     })
 
     try:
+        # Qualia changed this order, so cached get_order/get_orders results are stale
+        from services.qualia_client import get_qualia_client
+        get_qualia_client().invalidate_order(notification.order_id)
+
         # Store the activity notification
         activity_data = {
             "order_id": notification.order_id,
@@ -49,53 +70,50 @@ async def receive_activity_webhook(
             "message_id": notification.message_id
         }
 
-        store_activity(activity_data)
-
-        # If it's a message notification, fetch and store the full message details
+        # If it's a message notification, fetch the full message details so they
+        # can be stored together with the activity in one batch write
+        message_data = None
         if notification.type == "message" and notification.message_id:
             try:
-                client = QualiaClient()
-                # Fetch messages for this order to get the full message details
-                messages_response = client.get_messages_list()
-
-                # Find the specific message
-                if messages_response and "messages" in messages_response:
-                    message = next(
-                        (m for m in messages_response["messages"]
-                         if m.get("message_id") == notification.message_id),
-                        None
-                    )
-
-                    if message:
-                        # Store the full message details
-                        from services.dynamodb_service import store_message
-                        message_data = {
-                            "order_id": notification.order_id,
-                            "message_id": notification.message_id,
-                            "message_type": "message",
-                            "from_name": message.get("from_name", "Unknown"),
-                            "text": message.get("text", ""),
-                            "created_date": message.get("created_date", datetime.now(timezone.utc).isoformat()),
-                            "read": message.get("read", False),
-                            "order_number": message.get("order_number"),
-                            "attachments": message.get("attachments", [])
-                        }
-                        store_message(message_data)
-                        logger.info(f"Fetched and stored full message details for message {notification.message_id}")
-                    else:
-                        logger.warning(f"Message {notification.message_id} not found in messages list")
+                client = get_qualia_client()
+                # Find the specific message in the (cached) messages list
+                message = (await run_in_threadpool(_messages_by_id, client)).get(notification.message_id)
+                if message is None:
+                    # The cached list may predate this message; refetch once
+                    message = (await run_in_threadpool(_messages_by_id, client, True)).get(notification.message_id)
+
+                if message:
+                    message_data = {
+                        "order_id": notification.order_id,
+                        "message_id": notification.message_id,
+                        "message_type": "message",
+                        "from_name": message.get("from_name", "Unknown"),
+                        "text": message.get("text", ""),
+                        "created_date": message.get("created_date") or now_iso(),
+                        "read": message.get("read", False),
+                        "order_number": message.get("order_number"),
+                        "attachments": message.get("attachments", [])
+                    }
+                else:
+                    logger.warning("Message %s not found in messages list", notification.message_id)
             except Exception as msg_error:
                 # Log but don't fail the webhook if message fetching fails
-                logger.error(f"Failed to fetch message details: {str(msg_error)}", extra={
+                logger.error("Failed to fetch message details: %s", msg_error, extra={
                     "order_id": notification.order_id,
                     "message_id": notification.message_id,
                     "error": str(msg_error)
                 })
 
+        if message_data:
+            await run_in_threadpool(store_activity_with_message, activity_data, message_data)
+            logger.info("Fetched and stored full message details for message %s", notification.message_id)
+        else:
+            await run_in_threadpool(store_activity, activity_data)
+
         # Calculate response time
-        duration = (datetime.now(timezone.utc) - start).total_seconds() * 1000
+        duration = (time.perf_counter() - start) * 1000
 
-        logger.info(f"Successfully processed {notification.type} activity for order {notification.order_id}", extra={
+        logger.info("Successfully processed %s activity for order %s", notification.type, notification.order_id, extra={
             "order_id": notification.order_id,
             "activity_type": notification.type,
             "request_id": request_id,
@@ -112,7 +130,7 @@ async def receive_activity_webhook(
         }
 
     except Exception as e:
-        logger.error(f"Failed to process {notification.type} activity for order {notification.order_id}: {str(e)}", extra={
+        logger.error("Failed to process %s activity for order %s: %s", notification.type, notification.order_id, e, extra={
             "order_id": notification.order_id,
             "activity_type": notification.type,
             "request_id": request_id,
@@ -123,10 +141,23 @@ async def receive_activity_webhook(
             detail=f"Failed to process activity webhook: {str(e)}"
         )
 
+def _decode_next_token(next_token: str) -> dict:
+    """Decode a next_token back into a DynamoDB ExclusiveStartKey, rejecting malformed tokens with 400."""
+    try:
+        start_key = orjson.loads(base64.urlsafe_b64decode(next_token))
+    except ValueError:
+        start_key = None
+    if not isinstance(start_key, dict) or not start_key or not all(isinstance(v, str) for v in start_key.values()):
+        raise HTTPException(status_code=400, detail="Invalid next_token")
+    return start_key
+
 @router.get("/{order_id}")
 async def get_order_messages(
     order_id: str,
     message_type: str = None,
+    fields: str = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size"),
+    next_token: str = None,
     # auth = Depends(verify_webhook_auth)
 ):
     """Retrieve all messages for a specific order.
@@ -134,19 +165,40 @@ async def get_order_messages(
     Args:
         order_id: The order ID to retrieve messages for
         message_type: Optional filter for message type (message.received or message.sent)
+        fields: Optional comma-separated attributes to return (e.g. messageId,fromName,createdDate,read)
+        limit: Optional page size; when set (or next_token is given) one page is returned
+            along with a next_token for the following page
+        next_token: Token from a previous page's response
 
     Returns:
         List of messages for the order
     """
-    from services.dynamodb_service import get_messages_by_order
+    from services.dynamodb_service import get_messages_by_order, get_messages_page
 
-    logger.info(f"Retrieving messages for order {order_id}", extra={
+    logger.info("Retrieving messages for order %s", order_id, extra={
         "order_id": order_id,
         "message_type": message_type
     })
 
+    # Bad client input is a 400, so decode the token before the generic 500 handler
+    start_key = _decode_next_token(next_token) if next_token is not None else None
+
     try:
-        messages = get_messages_by_order(order_id, message_type)
+        projection = [f for f in fields.split(",") if f] if fields else None
+
+        if limit is not None or start_key is not None:
+            messages, last_key = await run_in_threadpool(
+                get_messages_page, order_id, message_type, limit, start_key, projection
+            )
+            return {
+                "order_id": order_id,
+                "message_type": message_type,
+                "count": len(messages),
+                "messages": messages,
+                "next_token": base64.urlsafe_b64encode(orjson.dumps(last_key)).decode() if last_key else None
+            }
+
+        messages = await run_in_threadpool(get_messages_by_order, order_id, message_type, projection)
 
         return {
             "order_id": order_id,
@@ -156,7 +208,7 @@ async def get_order_messages(
         }
 
     except Exception as e:
-        logger.error(f"Failed to retrieve messages for order {order_id}: {str(e)}", extra={
+        logger.error("Failed to retrieve messages for order %s: %s", order_id, e, extra={
             "order_id": order_id,
             "error": str(e)
         }, exc_info=True)
@@ -1,105 +1,154 @@
 # handlers/processing_worker.py
-import json
-import boto3
+import gzip
 import logging
+import orjson
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from models.order import RawOrder
+from models.queue_message import ProcessingJob
 from services.acl_adapter import QualiaToInternalAdapter
-from services.dynamodb_service import put_metadata
+from services.dynamodb_service import put_metadata, batch_put_metadata
+from services.s3_service import get_s3_client
 from config.settings import settings
+from utils.timeutils import now_iso
 
 logger = logging.getLogger(__name__)
-s3 = boto3.client('s3', region_name=settings.AWS_REGION)
 
-def handle_processing_event(event):
-    """Lambda handler for processing downloaded orders and sending to internal API."""
-    logger.info(f"Processing {len(event.get('Records', []))} processing records")
+# Settings are fixed for the life of the process
+_S3_BUCKET = settings.S3_BUCKET
+_INTERNAL_API_URL = settings.INTERNAL_API_URL
+
+# Shared session so connections to the internal API are reused across records
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+_session.headers.update({
+    "Authorization": f"Bearer {settings.INTERNAL_API_TOKEN}",
+    "Content-Type": "application/json"
+})
+
+# Records are independent and I/O-bound, so fan them out across threads
+_executor = ThreadPoolExecutor(max_workers=10)
+
+def _process_record(record):
+    """Process a single downloaded order and send it to the internal API."""
+    # Parse and validate the envelope in one pass
+    job = ProcessingJob.model_validate_json(record["body"])
+    order_id = job.order_id
+    s3_key = job.s3_key
+    checksum = job.checksum
+
+    logger.info("Starting processing for order %s", order_id, extra={
+        "order_id": order_id,
+        "s3_key": s3_key
+    })
+
+    try:
+        # 1. Retrieve raw payload from S3
+        response = get_s3_client().get_object(Bucket=_S3_BUCKET, Key=s3_key)
+        # Decode only the fields the ACL adapter consumes
+        raw_bytes = response['Body'].read()
+        if response.get('ContentEncoding') == 'gzip':
+            raw_bytes = gzip.decompress(raw_bytes)
+        raw_payload = RawOrder.model_validate_json(raw_bytes).model_dump(exclude_none=True)
+
+        logger.info("Retrieved order %s from S3", order_id, extra={
+            "order_id": order_id,
+            "s3_key": s3_key,
+            "payload_size": len(raw_bytes)
+        })
 
-    for record in event.get("Records", []):
-        body = json.loads(record["body"])
-        order_id = body["order_id"]
-        s3_key = body["s3_key"]
-        checksum = body.get("checksum")
+        # 2. Transform using ACL adapter
+        adapter = QualiaToInternalAdapter()
+        transformed_data = adapter.transform(raw_payload)
 
-        logger.info(f"Starting processing for order {order_id}", extra={
+        logger.info("Transformed order %s data", order_id, extra={
             "order_id": order_id,
-            "s3_key": s3_key
+            "transformed_fields": list(transformed_data.keys())
         })
 
-        try:
-            # 1. Retrieve raw payload from S3
-            response = s3.get_object(Bucket=settings.S3_BUCKET, Key=s3_key)
-            raw_payload = json.loads(response['Body'].read().decode('utf-8'))
+        # 3. Send to internal API
+        api_response = _session.post(
+            _INTERNAL_API_URL,
+            data=orjson.dumps(transformed_data),  # session sets Content-Type: application/json
+            timeout=30
+        )
 
-            logger.info(f"Retrieved order {order_id} from S3", extra={
+        if api_response.status_code in (200, 201):
+            logger.info("Successfully sent order %s to internal API", order_id, extra={
                 "order_id": order_id,
-                "s3_key": s3_key,
-                "payload_size": len(json.dumps(raw_payload))
+                "status_code": api_response.status_code,
+                "response": api_response.text
+            })
+
+            logger.info("Successfully completed processing for order %s", order_id, extra={
+                "order_id": order_id
             })
 
-            # 2. Transform using ACL adapter
-            adapter = QualiaToInternalAdapter()
-            transformed_data = adapter.transform(raw_payload)
+            # 4. PROCESSED status is written in one batch by the handler
+            return {
+                "order_id": order_id,
+                "status": "PROCESSED",
+                "extra": {
+                    "processed_at": now_iso(),
+                    "api_status_code": api_response.status_code,
+                    "checksum": checksum
+                }
+            }
 
-            logger.info(f"Transformed order {order_id} data", extra={
+        else:
+            logger.error("Internal API rejected order %s", order_id, extra={
                 "order_id": order_id,
-                "transformed_fields": list(transformed_data.keys())
+                "status_code": api_response.status_code,
+                "response": api_response.text
             })
+            raise RuntimeError(f"Internal API error: {api_response.status_code} - {api_response.text}")
 
-            # 3. Send to internal API
-            headers = {
-                "Authorization": f"Bearer {settings.INTERNAL_API_TOKEN}",
-                "Content-Type": "application/json"
-            }
+    except Exception as e:
+        logger.error("Processing failed for order %s: %s", order_id, e, extra={
+            "order_id": order_id,
+            "s3_key": s3_key,
+            "error": str(e)
+        }, exc_info=True)
 
-            api_response = requests.post(
-                settings.INTERNAL_API_URL,
-                json=transformed_data,
-                headers=headers,
-                timeout=30
-            )
-
-            if api_response.status_code in (200, 201):
-                logger.info(f"Successfully sent order {order_id} to internal API", extra={
-                    "order_id": order_id,
-                    "status_code": api_response.status_code,
-                    "response": api_response.text
-                })
-
-                # 4. Update DB with PROCESSED status
-                put_metadata(order_id, "PROCESSED", {
-                    "processed_at": datetime.utcnow().isoformat() + "Z",
-                    "api_status_code": api_response.status_code,
-                    "checksum": checksum
-                })
+        # Update DB with FAILED status
+        try:
+            put_metadata(order_id, "FAILED", {
+                "failed_at": now_iso(),
+                "error": str(e)
+            })
+        except Exception as db_error:
+            logger.error("Failed to update failure status for order %s: %s", order_id, db_error)
 
-                logger.info(f"Successfully completed processing for order {order_id}", extra={
-                    "order_id": order_id
-                })
+        raise
 
-            else:
-                logger.error(f"Internal API rejected order {order_id}", extra={
-                    "order_id": order_id,
-                    "status_code": api_response.status_code,
-                    "response": api_response.text
-                })
-                raise RuntimeError(f"Internal API error: {api_response.status_code} - {api_response.text}")
+def handle_processing_event(event):
+    """Lambda handler for processing downloaded orders and sending to internal API.
 
+    Returns a partial batch response so SQS only retries the failed records.
+    """
+    records = event.get("Records", [])
+    logger.info("Processing %s processing records", len(records))
+    failed_message_ids = []
+    processed = []
+
+    futures = {_executor.submit(_process_record, record): record for record in records}
+    for future in as_completed(futures):
+        try:
+            processed.append((futures[future]["messageId"], future.result()))
+        except Exception:
+            # Let SQS retry this record
+            failed_message_ids.append(futures[future]["messageId"])
+
+    if processed:
+        try:
+            batch_put_metadata([update for _, update in processed])
         except Exception as e:
-            logger.error(f"Processing failed for order {order_id}: {str(e)}", extra={
-                "order_id": order_id,
-                "s3_key": s3_key,
+            logger.error("Failed to record PROCESSED status: %s", e, extra={
                 "error": str(e)
             }, exc_info=True)
+            failed_message_ids.extend(message_id for message_id, _ in processed)
 
-            # Update DB with FAILED status
-            try:
-                put_metadata(order_id, "FAILED", {
-                    "failed_at": datetime.utcnow().isoformat() + "Z",
-                    "error": str(e)
-                })
-            except Exception as db_error:
-                logger.error(f"Failed to update failure status for order {order_id}: {str(db_error)}")
-
-            # Let SQS retry
-            raise
+    return {
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids]
+    }
@@ -1,51 +1,55 @@
 # handlers/webhook_handler.py
+import time
 import uuid
 import logging
-from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from models.webhook import WebhookNotification
 from services.dynamodb_service import put_metadata
 from services.sqs_service import send_to_download_queue
 from utils.auth import verify_webhook_auth
+from utils.logger import RequestLogger
+from utils.request_body import json_body, json_body_openapi
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("")
+@router.post("", openapi_extra=json_body_openapi(WebhookNotification))
 async def receive_webhook(
-    notification: WebhookNotification,
-    auth = Depends(verify_webhook_auth)
+    auth = Depends(verify_webhook_auth),
+    notification: WebhookNotification = Depends(json_body(WebhookNotification))
 ):
     """Receive webhook notification from Qualia and queue for processing."""
     request_id = str(uuid.uuid4())[:8]
-    start = datetime.utcnow()
+    start = time.perf_counter()
 
-    logger.info(f"Received webhook for order {notification.order_id}", extra={
-        "order_id": notification.order_id,
-        "request_id": request_id,
+    log = RequestLogger(logger, {"order_id": notification.order_id, "request_id": request_id})
+    log.info("Received webhook for order %s", notification.order_id, extra={
         "notification_type": notification.notification_type
     })
 
     try:
         # 1. Write NOTIFIED to DynamoDB
-        put_metadata(
+        # boto3 calls block, so run them off the event loop
+        await run_in_threadpool(
+            put_metadata,
             order_id=notification.order_id,
             status="NOTIFIED",
-            extra={"request_id": request_id}
+            extra={"request_id": request_id},
+            if_absent=True
         )
 
-        # 2. Send to Download SQS
-        send_to_download_queue(
+        # 2. Send to Download SQS only once the NOTIFIED write has landed
+        await run_in_threadpool(
+            send_to_download_queue,
             order_id=notification.order_id,
             notified_at=notification.timestamp
         )
 
         # 3. Respond fast (<50ms)
-        duration = (datetime.utcnow() - start).total_seconds() * 1000
+        duration = (time.perf_counter() - start) * 1000
 
-        logger.info(f"Successfully processed webhook for order {notification.order_id}", extra={
-            "order_id": notification.order_id,
-            "request_id": request_id,
+        log.info("Successfully processed webhook for order %s", notification.order_id, extra={
             "response_time_ms": round(duration, 2)
         })
 
@@ -57,9 +61,7 @@ async def receive_webhook(
         }
 
     except Exception as e:
-        logger.error(f"Failed to process webhook for order {notification.order_id}: {str(e)}", extra={
-            "order_id": notification.order_id,
-            "request_id": request_id,
+        log.error("Failed to process webhook for order %s: %s", notification.order_id, e, extra={
             "error": str(e)
         }, exc_info=True)
         raise HTTPException(
@@ -2,6 +2,7 @@
 import uvicorn
 import logging
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from mangum import Mangum
 from handlers.webhook_handler import router as webhook_router
 from handlers.message_webhook_handler import router as message_webhook_router
@@ -17,7 +18,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Qualia Marketplace Webhook",
     version="1.0.0",
-    description="Decoupled webhook integration with claim-check and ACL"
+    description="Decoupled webhook integration with claim-check and ACL",
+    default_response_class=ORJSONResponse
 )
 
 # Health check endpoint with more details
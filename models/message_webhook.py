@@ -1,6 +1,6 @@
 # models/message_webhook.py
-from pydantic import BaseModel, Field, field_validator
-from typing import Literal, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Literal, Optional
 
 class QualiaActivityNotification(BaseModel):
     """Webhook notification model for Qualia Marketplace Activity events.
@@ -17,17 +17,10 @@ class QualiaActivityNotification(BaseModel):
         "message",
         "documents"
     ] = Field(..., description="Type of activity notification")
-    order_id: str = Field(..., description="Qualia order ID")
+    # Non-empty check runs in pydantic-core instead of a Python validator
+    order_id: Annotated[str, StringConstraints(min_length=1, strip_whitespace=True)] = Field(..., description="Qualia order ID")
     message_id: Optional[str] = Field(None, description="Message ID (only present for message type)")
 
-    @field_validator("order_id")
-    @classmethod
-    def validate_order_id(cls, v: str) -> str:
-        """Validate order_id is not empty."""
-        if not v or len(v.strip()) == 0:
-            raise ValueError("order_id cannot be empty")
-        return v
-
     class Config:
         json_schema_extra = {
             "examples": [
@@ -56,3 +56,25 @@ class GetOrderResponse(BaseModel):
 class GetOrderResult(BaseModel):
     """Complete result from GetOrder query."""
     order: GetOrderResponse
+
+
+class RawOrderProperty(BaseModel):
+    """Property fields read by the ACL adapter from a raw Qualia order."""
+    address_1: Optional[Any] = None
+    city: Optional[Any] = None
+    state: Optional[Any] = None
+    zipcode: Optional[Any] = None
+
+
+class RawOrder(BaseModel):
+    """Subset of a raw Qualia order consumed by QualiaToInternalAdapter.
+
+    Fields not declared here are skipped while parsing, so decoding a large
+    stored payload only materializes what the transform needs.
+    """
+    order_number: Optional[Any] = None
+    vertical: Optional[Any] = None
+    product_type: Optional[Any] = None
+    customer_name: Optional[Any] = None
+    due_date: Optional[Any] = None
+    properties: Optional[List[RawOrderProperty]] = None
@@ -1,6 +1,7 @@
 # models/order_operations.py
 from pydantic import BaseModel, Field
-from typing import Optional, List, Any, Dict
+from typing import Annotated, Optional, List, Any, Dict
+from typing_extensions import Required, TypedDict
 
 
 class AcceptOrderInput(BaseModel):
@@ -37,6 +38,13 @@ class FileData(BaseModel):
     base_64: str = Field(..., description="Base64 encoded file content", examples=["VGhpcyBpcyBhIGRvY3VtZW50IHN1Ym1pdHRlZCBvdmVyIFF1YWxpYSBNYXJrZXRwbGFjZSBBUEkgaW4gYmFzZTY0IGVuY29kaW5nLg=="])
     is_primary: Optional[bool] = Field(None, description="Whether this is a primary document", examples=[True])
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for the GraphQL mutation, omitting an unset is_primary."""
+        d = {"name": self.name, "base_64": self.base_64}
+        if self.is_primary is not None:
+            d["is_primary"] = self.is_primary
+        return d
+
 
 class AddFilesInput(BaseModel):
     """Input for adding files to an order."""
@@ -62,120 +70,123 @@ class RemoveFilesResponse(BaseModel):
 
 
 # Title Search Models
+#
+# Nested form parts are TypedDicts: the outer TitleSearchForm model still
+# validates the whole tree, but no model instance is built per nested object.
 
-class SeniorLien(BaseModel):
+class SeniorLien(TypedDict, total=False):
     """Senior lien data."""
-    recorded_date: Optional[str] = Field(None, examples=["2025-11-08"])
-    instrument_number: Optional[str] = Field(None, examples=["233"])
-    book: Optional[str] = Field(None, examples=["12"])
-    page: Optional[str] = Field(None, examples=["1"])
+    recorded_date: Annotated[Optional[str], Field(examples=["2025-11-08"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["233"])]
+    book: Annotated[Optional[str], Field(examples=["12"])]
+    page: Annotated[Optional[str], Field(examples=["1"])]
 
 
-class Subordination(BaseModel):
+class Subordination(TypedDict, total=False):
     """Subordination data."""
-    recorded_date: Optional[str] = Field(None, examples=["2025-11-08"])
-    instrument_number: Optional[str] = Field(None, examples=["654"])
-    book: Optional[str] = Field(None, examples=["456"])
-    page: Optional[str] = Field(None, examples=["44"])
-    senior_lien: Optional[SeniorLien] = None
+    recorded_date: Annotated[Optional[str], Field(examples=["2025-11-08"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["654"])]
+    book: Annotated[Optional[str], Field(examples=["456"])]
+    page: Annotated[Optional[str], Field(examples=["44"])]
+    senior_lien: Optional[SeniorLien]
 
 
-class Assignment(BaseModel):
+class Assignment(TypedDict, total=False):
     """Assignment data."""
-    assignee: Optional[str] = Field(None, examples=["assignee"])
-    recorded_date: Optional[str] = Field(None, examples=["2021-02-02"])
-    instrument_number: Optional[str] = Field(None, examples=["234"])
-    book: Optional[str] = Field(None, examples=["234"])
-    page: Optional[str] = Field(None, examples=["23"])
+    assignee: Annotated[Optional[str], Field(examples=["assignee"])]
+    recorded_date: Annotated[Optional[str], Field(examples=["2021-02-02"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["234"])]
+    book: Annotated[Optional[str], Field(examples=["234"])]
+    page: Annotated[Optional[str], Field(examples=["23"])]
 
 
-class Encumbrance(BaseModel):
+class Encumbrance(TypedDict, total=False):
     """Encumbrance data."""
-    type: Optional[str] = Field(None, examples=["MORTGAGE_LIEN"])
-    lender: Optional[str] = Field(None, examples=["Big Red Bank"])
-    amount: Optional[str] = Field(None, examples=["4323.22"])
-    certificate_of_title_number: Optional[str] = Field(None, examples=["345"])
-    mortgage_date: Optional[str] = Field(None, examples=["2022-01-01"])
-    mortgagor: Optional[str] = Field(None, examples=["Big Red Bank"])
-    deed_of_trust_date: Optional[str] = Field(None, examples=["2022-01-02"])
-    trustor: Optional[str] = Field(None, examples=["trustor"])
-    trustee: Optional[str] = Field(None, examples=["trustee"])
-    assignments: Optional[Assignment] = None
-    subordinations: Optional[Subordination] = None
-    recorded_date: Optional[str] = Field(None, examples=["2025-11-09"])
-    instrument_number: Optional[str] = Field(None, examples=["22"])
-    book: Optional[str] = Field(None, examples=["23"])
-    page: Optional[str] = Field(None, examples=["4322"])
-    document_number: Optional[str] = Field(None, examples=["2"])
-
-
-class Deed(BaseModel):
+    type: Annotated[Optional[str], Field(examples=["MORTGAGE_LIEN"])]
+    lender: Annotated[Optional[str], Field(examples=["Big Red Bank"])]
+    amount: Annotated[Optional[str], Field(examples=["4323.22"])]
+    certificate_of_title_number: Annotated[Optional[str], Field(examples=["345"])]
+    mortgage_date: Annotated[Optional[str], Field(examples=["2022-01-01"])]
+    mortgagor: Annotated[Optional[str], Field(examples=["Big Red Bank"])]
+    deed_of_trust_date: Annotated[Optional[str], Field(examples=["2022-01-02"])]
+    trustor: Annotated[Optional[str], Field(examples=["trustor"])]
+    trustee: Annotated[Optional[str], Field(examples=["trustee"])]
+    assignments: Optional[Assignment]
+    subordinations: Optional[Subordination]
+    recorded_date: Annotated[Optional[str], Field(examples=["2025-11-09"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["22"])]
+    book: Annotated[Optional[str], Field(examples=["23"])]
+    page: Annotated[Optional[str], Field(examples=["4322"])]
+    document_number: Annotated[Optional[str], Field(examples=["2"])]
+
+
+class Deed(TypedDict, total=False):
     """Deed data."""
-    grantor: Optional[str] = Field(None, examples=["grantor"])
-    grantee: Optional[str] = Field(None, examples=["grantee"])
-    deed_date: Optional[str] = Field(None, examples=["2025-11-10"])
-    recorded_date: Optional[str] = Field(None, examples=["2025-11-06"])
-    instrument_number: Optional[str] = Field(None, examples=["234"])
-    book: Optional[str] = Field(None, examples=["34"])
-    page: Optional[str] = Field(None, examples=["23"])
-    certificate_of_title_number: Optional[str] = Field(None, examples=["234234"])
-    document_number: Optional[str] = Field(None, examples=["g23"])
-
-
-class PropertyData(BaseModel):
+    grantor: Annotated[Optional[str], Field(examples=["grantor"])]
+    grantee: Annotated[Optional[str], Field(examples=["grantee"])]
+    deed_date: Annotated[Optional[str], Field(examples=["2025-11-10"])]
+    recorded_date: Annotated[Optional[str], Field(examples=["2025-11-06"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["234"])]
+    book: Annotated[Optional[str], Field(examples=["34"])]
+    page: Annotated[Optional[str], Field(examples=["23"])]
+    certificate_of_title_number: Annotated[Optional[str], Field(examples=["234234"])]
+    document_number: Annotated[Optional[str], Field(examples=["g23"])]
+
+
+class PropertyData(TypedDict, total=False):
     """Property data for title search."""
-    parcel_ids: Optional[str] = Field(None, examples=["23423kjh234"])
-    legal_description: Optional[str] = Field(None, examples=["legal description"])
-    estate_type: Optional[str] = Field(None, examples=["estateType"])
-    title_vesting: Optional[str] = Field(None, examples=["Mr. and Mrs. Smith"])
-    deeds: Optional[Deed] = None
-    encumbrances: Optional[Encumbrance] = None
+    parcel_ids: Annotated[Optional[str], Field(examples=["23423kjh234"])]
+    legal_description: Annotated[Optional[str], Field(examples=["legal description"])]
+    estate_type: Annotated[Optional[str], Field(examples=["estateType"])]
+    title_vesting: Annotated[Optional[str], Field(examples=["Mr. and Mrs. Smith"])]
+    deeds: Optional[Deed]
+    encumbrances: Optional[Encumbrance]
 
 
-class AdditionalCost(BaseModel):
+class AdditionalCost(TypedDict, total=False):
     """Additional cost item."""
-    name: str = Field(..., examples=["Copies"])
-    cost_per_unit: str = Field(..., examples=["0.50"])
-    units: int = Field(..., examples=[4])
-    is_discount: bool = Field(False, examples=[False])
+    name: Required[Annotated[str, Field(examples=["Copies"])]]
+    cost_per_unit: Required[Annotated[str, Field(examples=["0.50"])]]
+    units: Required[Annotated[int, Field(examples=[4])]]
+    is_discount: Annotated[bool, Field(examples=[False])]
 
 
-class TemplateData(BaseModel):
+class TemplateData(TypedDict, total=False):
     """Template data for requirements."""
-    petitioner: Optional[str] = Field(None, examples=["Petitioner Field"])
-    respondent: Optional[str] = Field(None, examples=["Respondent Field"])
-    date: Optional[str] = Field(None, examples=["2022-01-01"])
-    caseNumber: Optional[str] = Field(None, examples=["234234"])
-    courtName: Optional[str] = Field(None, examples=["Matagorda County 120th"])
+    petitioner: Annotated[Optional[str], Field(examples=["Petitioner Field"])]
+    respondent: Annotated[Optional[str], Field(examples=["Respondent Field"])]
+    date: Annotated[Optional[str], Field(examples=["2022-01-01"])]
+    caseNumber: Annotated[Optional[str], Field(examples=["234234"])]
+    courtName: Annotated[Optional[str], Field(examples=["Matagorda County 120th"])]
 
 
-class TemplatedText(BaseModel):
+class TemplatedText(TypedDict, total=False):
     """Templated text for requirements."""
-    template_string: Optional[str] = Field(None, examples=["Template String"])
-    sub_types: Optional[List[str]] = Field(None, examples=[["subType1", "subType2"]])
-    template_data: Optional[TemplateData] = None
-    code: Optional[str] = Field(None, examples=["Divorce Decree"])
+    template_string: Annotated[Optional[str], Field(examples=["Template String"])]
+    sub_types: Annotated[Optional[List[str]], Field(examples=[["subType1", "subType2"]])]
+    template_data: Optional[TemplateData]
+    code: Annotated[Optional[str], Field(examples=["Divorce Decree"])]
 
 
-class ImproperMortgageLien(BaseModel):
+class ImproperMortgageLien(TypedDict, total=False):
     """Improper mortgage lien data."""
-    lender: Optional[str] = Field(None, examples=["Lender Field"])
-    mortgage_date: Optional[str] = Field(None, examples=["2025-11-06"])
-    amount: Optional[str] = Field(None, examples=["35,456.00"])
-    recorded_date: Optional[str] = Field(None, examples=["2025-11-06"])
-    instrument_number: Optional[str] = Field(None, examples=["234"])
-    book: Optional[str] = Field(None, examples=["23"])
-    page: Optional[str] = Field(None, examples=["1"])
-    hyperlink: Optional[str] = Field(None, examples=["www.qualia.com"])
+    lender: Annotated[Optional[str], Field(examples=["Lender Field"])]
+    mortgage_date: Annotated[Optional[str], Field(examples=["2025-11-06"])]
+    amount: Annotated[Optional[str], Field(examples=["35,456.00"])]
+    recorded_date: Annotated[Optional[str], Field(examples=["2025-11-06"])]
+    instrument_number: Annotated[Optional[str], Field(examples=["234"])]
+    book: Annotated[Optional[str], Field(examples=["23"])]
+    page: Annotated[Optional[str], Field(examples=["1"])]
+    hyperlink: Annotated[Optional[str], Field(examples=["www.qualia.com"])]
 
 
-class Requirement(BaseModel):
+class Requirement(TypedDict, total=False):
     """Requirement item - flexible to handle different types."""
-    type: str = Field(..., examples=["templatedText"])
-    indent: Optional[bool] = Field(None, examples=[False])
-    text: Optional[str] = Field(None, examples=["Terms and provisions of a Decree of Divorce..."])
-    templatedText: Optional[TemplatedText] = None
-    improperMortgageLien: Optional[ImproperMortgageLien] = None
+    type: Required[Annotated[str, Field(examples=["templatedText"])]]
+    indent: Annotated[Optional[bool], Field(examples=[False])]
+    text: Annotated[Optional[str], Field(examples=["Terms and provisions of a Decree of Divorce..."])]
+    templatedText: Optional[TemplatedText]
+    improperMortgageLien: Optional[ImproperMortgageLien]
 
 
 class TitleSearchForm(BaseModel):
@@ -0,0 +1,16 @@
+# models/queue_message.py
+from pydantic import BaseModel
+from typing import Optional
+
+
+class DownloadJob(BaseModel):
+    """Message body on the download queue."""
+    order_id: str
+    notified_at: Optional[str] = None
+
+
+class ProcessingJob(BaseModel):
+    """Message body on the processing queue."""
+    order_id: str
+    s3_key: str
+    checksum: Optional[str] = None
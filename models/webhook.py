@@ -25,7 +25,7 @@ class WebhookNotification(BaseModel):
         """Validate timestamp is in valid ISO 8601 format."""
         try:
             # Try parsing to ensure it's a valid datetime
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
+            datetime.fromisoformat(v[:-1] + '+00:00' if v.endswith('Z') else v)
         except (ValueError, AttributeError) as e:
             raise ValueError(f"timestamp must be valid ISO 8601 format: {e}")
         return v
\ No newline at end of file
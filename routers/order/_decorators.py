@@ -0,0 +1,32 @@
+# routers/order/_decorators.py
+import functools
+import logging
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+
+logger = logging.getLogger(__name__)
+
+
+def map_errors(op: str):
+    """
+    Map QualiaClient failures in an order endpoint to HTTP 500 responses.
+
+    RuntimeError (raised by QualiaClient after retries) keeps its message as the
+    detail; anything else is logged with its traceback and reported as an
+    internal server error.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except (HTTPException, RequestValidationError):
+                raise
+            except RuntimeError as e:
+                logger.error("Failed to %s: %s", op, e)
+                raise HTTPException(status_code=500, detail=str(e))
+            except Exception as e:
+                logger.exception("Unexpected error in %s", op)
+                raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+        return wrapper
+    return deco
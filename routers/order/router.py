@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from services.qualia_client import QualiaClient
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from services.qualia_client import QualiaClient, get_qualia_client
 from models.cancel_order import CancelOrderInput, CancelOrderResult
 from models.order import OrderStatus
 from models.order_operations import (
@@ -10,23 +13,40 @@ from models.order_operations import (
     RemoveFilesInput,
     FulfillTitleSearchInputWrapper
 )
+from routers.order._decorators import map_errors
+from utils.request_body import json_body, json_body_openapi
 from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+_VALIDATE_INBOUND = settings.VALIDATE_INBOUND
+_fulfill_title_search_body = json_body(FulfillTitleSearchInputWrapper)
+
 router = APIRouter(
     prefix="/orders",
     tags=["Orders"]
 )
 
+# Order actions that only forward an order_id to QualiaClient
+ORDER_ACTIONS = {
+    "accept": "accept_order",
+    "submit": "submit_order",
+}
+
+
+def _run_order_action(action: str, client: QualiaClient, order_id: str) -> Dict[str, Any]:
+    """Dispatch an order_id-only action to the matching QualiaClient method."""
+    logger.info("Received %s order request for %s", action, order_id)
 
-def get_qualia_client() -> QualiaClient:
-    """Dependency to get QualiaClient instance."""
-    return QualiaClient()
+    result = getattr(client, ORDER_ACTIONS[action])(order_id=order_id)
 
+    logger.info("Successfully processed %s order request for %s", action, order_id)
+    return result
 
-@router.get("/", response_model=Dict[str, Any])
+
+@router.get("/", response_model=None)
+@map_errors("fetch orders")
 async def get_orders(
     status: Optional[OrderStatus] = Query(None, description="Filter by order status"),
     customer_id: Optional[str] = Query(None, description="Filter by customer ID"),
@@ -52,36 +72,29 @@ async def get_orders(
     Raises:
         HTTPException: If the orders retrieval fails
     """
-    try:
-        # Build filters dict, excluding None values
-        filters = {}
-        if status:
-            filters["status"] = status.value
-        if customer_id:
-            filters["customer_id"] = customer_id
-        if order_number:
-            filters["order_number"] = order_number
-        if limit:
-            filters["limit"] = limit
-        if offset:
-            filters["offset"] = offset
-
-        logger.info(f"Received get orders request with filters: {filters}")
-
-        result = client.get_orders(filters=filters if filters else None)
-
-        logger.info("Successfully processed get orders request")
-        return result
-
-    except RuntimeError as e:
-        logger.error(f"Failed to fetch orders: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error fetching orders: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-
-
-@router.get("/{order_id}", response_model=Dict[str, Any])
+    # Build filters dict, excluding None values
+    filters = {}
+    if status is not None:
+        filters["status"] = status.value
+    if customer_id is not None:
+        filters["customer_id"] = customer_id
+    if order_number is not None:
+        filters["order_number"] = order_number
+    if limit is not None:
+        filters["limit"] = limit
+    if offset is not None:
+        filters["offset"] = offset
+
+    logger.info("Received get orders request with filters: %s", filters)
+
+    result = await run_in_threadpool(client.get_orders, filters=filters or None)
+
+    logger.info("Successfully processed get orders request")
+    return result
+
+
+@router.get("/{order_id}", response_model=None)
+@map_errors("fetch order")
 async def get_order(
     order_id: str,
     client: QualiaClient = Depends(get_qualia_client)
@@ -99,23 +112,16 @@ async def get_order(
     Raises:
         HTTPException: If the order retrieval fails
     """
-    try:
-        logger.info(f"Received get order request for {order_id}")
+    logger.info("Received get order request for %s", order_id)
 
-        result = client.get_order(order_id=order_id)
+    result = await run_in_threadpool(client.get_order, order_id=order_id)
 
-        logger.info(f"Successfully processed get order request for {order_id}")
-        return result
+    logger.info("Successfully processed get order request for %s", order_id)
+    return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to fetch order {order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error fetching order {order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-
-@router.post("/accept", response_model=Dict[str, Any])
+@router.post("/accept", response_model=None)
+@map_errors("accept order")
 async def accept_order(
     order_id: str,
     client: QualiaClient = Depends(get_qualia_client)
@@ -133,25 +139,13 @@ async def accept_order(
     Raises:
         HTTPException: If the acceptance fails
     """
-    try:
-        logger.info(f"Received accept order request for {order_id}")
-
-        result = client.accept_order(order_id=order_id)
+    return await run_in_threadpool(_run_order_action, "accept", client, order_id)
 
-        logger.info(f"Successfully processed accept order request for {order_id}")
-        return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to accept order {order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error accepting order {order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}") 
-
-
-@router.post("/cancel", response_model=CancelOrderResult)
+@router.post("/cancel", response_model=CancelOrderResult, openapi_extra=json_body_openapi(CancelOrderInput))
+@map_errors("cancel order")
 async def cancel_order(
-    cancel_input: CancelOrderInput,
+    cancel_input: CancelOrderInput = Depends(json_body(CancelOrderInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -167,28 +161,22 @@ async def cancel_order(
     Raises:
         HTTPException: If the cancellation fails
     """
-    try:
-        logger.info(f"Received cancel order request for {cancel_input.order_id}")
-
-        result = client.cancel_order(
-            order_id=cancel_input.order_id,
-            cancellation_reason=cancel_input.cancellation_reason
-        )
+    logger.info("Received cancel order request for %s", cancel_input.order_id)
 
-        logger.info(f"Successfully processed cancel order request for {cancel_input.order_id}")
-        return result
+    result = await run_in_threadpool(
+        client.cancel_order,
+        order_id=cancel_input.order_id,
+        cancellation_reason=cancel_input.cancellation_reason
+    )
 
-    except RuntimeError as e:
-        logger.error(f"Failed to cancel order {cancel_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error cancelling order {cancel_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    logger.info("Successfully processed cancel order request for %s", cancel_input.order_id)
+    return result
 
 
-@router.post("/decline", response_model=Dict[str, Any])
+@router.post("/decline", response_model=None, openapi_extra=json_body_openapi(DeclineOrderInput))
+@map_errors("decline order")
 async def decline_order(
-    decline_input: DeclineOrderInput,
+    decline_input: DeclineOrderInput = Depends(json_body(DeclineOrderInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -204,28 +192,22 @@ async def decline_order(
     Raises:
         HTTPException: If the decline operation fails
     """
-    try:
-        logger.info(f"Received decline order request for {decline_input.order_id}")
+    logger.info("Received decline order request for %s", decline_input.order_id)
 
-        result = client.decline_order(
-            order_id=decline_input.order_id,
-            decline_reason=decline_input.decline_reason
-        )
+    result = await run_in_threadpool(
+        client.decline_order,
+        order_id=decline_input.order_id,
+        decline_reason=decline_input.decline_reason
+    )
 
-        logger.info(f"Successfully processed decline order request for {decline_input.order_id}")
-        return result
+    logger.info("Successfully processed decline order request for %s", decline_input.order_id)
+    return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to decline order {decline_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error declining order {decline_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-
-@router.post("/submit", response_model=Dict[str, Any])
+@router.post("/submit", response_model=None, openapi_extra=json_body_openapi(SubmitOrderInput))
+@map_errors("submit order")
 async def submit_order(
-    submit_input: SubmitOrderInput,
+    submit_input: SubmitOrderInput = Depends(json_body(SubmitOrderInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -241,25 +223,13 @@ async def submit_order(
     Raises:
         HTTPException: If the submission fails
     """
-    try:
-        logger.info(f"Received submit order request for {submit_input.order_id}")
-
-        result = client.submit_order(order_id=submit_input.order_id)
+    return await run_in_threadpool(_run_order_action, "submit", client, submit_input.order_id)
 
-        logger.info(f"Successfully processed submit order request for {submit_input.order_id}")
-        return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to submit order {submit_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error submitting order {submit_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-
-
-@router.post("/message", response_model=Dict[str, Any])
+@router.post("/message", response_model=None, openapi_extra=json_body_openapi(MessageInput))
+@map_errors("send message")
 async def send_message(
-    message_input: MessageInput,
+    message_input: MessageInput = Depends(json_body(MessageInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -275,24 +245,18 @@ async def send_message(
     Raises:
         HTTPException: If sending the message fails
     """
-    try:
-        logger.info(f"Received send message request for order {message_input.order_id}")
+    logger.info("Received send message request for order %s", message_input.order_id)
 
-        result = client.send_message(
-            order_id=message_input.order_id,
-            text=message_input.text,
-            attachments=message_input.attachments
-        )
+    result = await run_in_threadpool(
+        client.send_message,
+        order_id=message_input.order_id,
+        text=message_input.text,
+        attachments=message_input.attachments
+    )
 
-        logger.info(f"Successfully sent message to order {message_input.order_id}")
-        return result
+    logger.info("Successfully sent message to order %s", message_input.order_id)
+    return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to send message to order {message_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error sending message to order {message_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/messages/")
 async def get_messages(
@@ -304,11 +268,12 @@ async def get_messages(
         order_id: The unique identifier of the order to retrieve messages for
         client: QualiaClient instance (injected via dependency)
     """
-    return client.get_messages_list()
+    return await run_in_threadpool(client.get_messages_list)
 
-@router.post("/files/add", response_model=Dict[str, Any])
+@router.post("/files/add", response_model=None, openapi_extra=json_body_openapi(AddFilesInput))
+@map_errors("add files")
 async def add_files(
-    add_files_input: AddFilesInput,
+    add_files_input: AddFilesInput = Depends(json_body(AddFilesInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -324,28 +289,22 @@ async def add_files(
     Raises:
         HTTPException: If adding files fails
     """
-    try:
-        logger.info(f"Received add files request for order {add_files_input.order_id}")
-
-        result = client.add_files(
-            order_id=add_files_input.order_id,
-            files=add_files_input.files.model_dump(exclude_none=True)
-        )
+    logger.info("Received add files request for order %s", add_files_input.order_id)
 
-        logger.info(f"Successfully added files to order {add_files_input.order_id}")
-        return result
+    result = await run_in_threadpool(
+        client.add_files,
+        order_id=add_files_input.order_id,
+        files=add_files_input.files.to_dict()
+    )
 
-    except RuntimeError as e:
-        logger.error(f"Failed to add files to order {add_files_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error adding files to order {add_files_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    logger.info("Successfully added files to order %s", add_files_input.order_id)
+    return result
 
 
-@router.post("/files/remove", response_model=Dict[str, Any])
+@router.post("/files/remove", response_model=None, openapi_extra=json_body_openapi(RemoveFilesInput))
+@map_errors("remove files")
 async def remove_files(
-    remove_files_input: RemoveFilesInput,
+    remove_files_input: RemoveFilesInput = Depends(json_body(RemoveFilesInput)),
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
@@ -361,35 +320,33 @@ async def remove_files(
     Raises:
         HTTPException: If removing files fails
     """
-    try:
-        logger.info(f"Received remove files request for order {remove_files_input.order_id}")
+    logger.info("Received remove files request for order %s", remove_files_input.order_id)
 
-        result = client.remove_files(
-            order_id=remove_files_input.order_id,
-            file_ids=remove_files_input.file_ids
-        )
+    result = await run_in_threadpool(
+        client.remove_files,
+        order_id=remove_files_input.order_id,
+        file_ids=remove_files_input.file_ids
+    )
 
-        logger.info(f"Successfully removed files from order {remove_files_input.order_id}")
-        return result
+    logger.info("Successfully removed files from order %s", remove_files_input.order_id)
+    return result
 
-    except RuntimeError as e:
-        logger.error(f"Failed to remove files from order {remove_files_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error removing files from order {remove_files_input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-
-@router.post("/fulfill-title-search", response_model=Dict[str, Any])
+@router.post("/fulfill-title-search", response_model=None, openapi_extra=json_body_openapi(FulfillTitleSearchInputWrapper))
+@map_errors("fulfill title search")
 async def fulfill_title_search(
-    wrapper: FulfillTitleSearchInputWrapper,
+    request: Request,
     client: QualiaClient = Depends(get_qualia_client)
 ):
     """
     Fulfill title search for an order via Qualia GraphQL API.
 
+    The body is the GraphQL-shaped {"input": {"order_id", "form"}} wrapper. It is
+    validated against FulfillTitleSearchInputWrapper unless VALIDATE_INBOUND is
+    off, in which case only the envelope is checked and the form is forwarded as is.
+
     Args:
-        wrapper: Wrapped input with order_id and form data
+        request: Incoming request carrying the wrapped order_id and form data
         client: QualiaClient instance (injected via dependency)
 
     Returns:
@@ -398,21 +355,30 @@ async def fulfill_title_search(
     Raises:
         HTTPException: If fulfilling title search fails
     """
-    try:
-        fulfill_input = wrapper.input
-        logger.info(f"Received fulfill title search request for order {fulfill_input.order_id}")
-
-        result = client.fulfill_title_search(
-            order_id=fulfill_input.order_id,
-            form=fulfill_input.form.model_dump(exclude_unset=True, exclude_none=True)
-        )
-
-        logger.info(f"Successfully fulfilled title search for order {fulfill_input.order_id}")
-        return result
-
-    except RuntimeError as e:
-        logger.error(f"Failed to fulfill title search for order {wrapper.input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error fulfilling title search for order {wrapper.input.order_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
+    if _VALIDATE_INBOUND:
+        fulfill_input = (await _fulfill_title_search_body(request)).input
+        order_id = fulfill_input.order_id
+        form = fulfill_input.form.model_dump(exclude_none=True)
+    else:
+        try:
+            fulfill_input = orjson.loads(await request.body())["input"]
+            order_id = fulfill_input["order_id"]
+            form = _drop_none(fulfill_input.get("form") or {})
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+            raise HTTPException(status_code=422, detail="Body must be {\"input\": {\"order_id\": ..., \"form\": {...}}}")
+
+    logger.info("Received fulfill title search request for order %s", order_id)
+
+    result = await run_in_threadpool(client.fulfill_title_search, order_id=order_id, form=form)
+
+    logger.info("Successfully fulfilled title search for order %s", order_id)
+    return result
+
+
+def _drop_none(value):
+    """Recursively drop None values from a decoded JSON form."""
+    if isinstance(value, dict):
+        return {k: _drop_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_none(v) for v in value]
+    return value
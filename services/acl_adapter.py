@@ -3,27 +3,36 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Comprehensive US state mapping
+STATE_NAMES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
+    "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
+    "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
+    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
+    "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia",
+    "PR": "Puerto Rico", "VI": "Virgin Islands", "GU": "Guam", "AS": "American Samoa"
+}
+
+
+def _lookup_state(code: str) -> str:
+    """Look up a state name, only uppercasing codes that aren't already canonical."""
+    name = STATE_NAMES.get(code)
+    if name is None:
+        name = STATE_NAMES.get(code.upper(), "")
+    return name
+
+
 class QualiaToInternalAdapter:
     """Adapter to transform Qualia data format to internal API format."""
 
-    # Comprehensive US state mapping
-    STATE_NAMES = {
-        "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
-        "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
-        "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
-        "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
-        "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
-        "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
-        "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
-        "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
-        "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
-        "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
-        "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
-        "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
-        "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia",
-        "PR": "Puerto Rico", "VI": "Virgin Islands", "GU": "Guam", "AS": "American Samoa"
-    }
-
     FIELD_MAPPING = {
         'order_id': 'externalOrderId',
         'vertical': 'productCategory',
@@ -33,36 +42,51 @@ class QualiaToInternalAdapter:
 
     def transform(self, qualia_data: dict) -> dict:
         """Transform Qualia order data to internal API format."""
-        logger.debug(f"Transforming Qualia data with order_number: {qualia_data.get('order_number')}")
-
-        internal = {
-            "externalOrderId": qualia_data.get("order_number"),
-            "productCategory": qualia_data.get("vertical", "").upper(),
-            "productType": qualia_data.get("product_type"),
-            "source": "QUALIA_MARKETPLACE",
-            "state": self._extract_state(qualia_data),
-            "properties": self._extract_properties(qualia_data),
-            "agency": {"agencyName": qualia_data.get("customer_name", "")},
-            "dueDate": qualia_data.get("due_date"),
-            "notes": ""
-        }
-        # Filter out None values
-        result = {k: v for k, v in internal.items() if v is not None}
-        logger.debug(f"Transformed data fields: {list(result.keys())}")
+        logger.debug("Transforming Qualia data with order_number: %s", qualia_data.get('order_number'))
+
+        get = qualia_data.get
+        props = get("properties") or []
+
+        # Optional keys are only inserted when present, so no None-filter pass is needed
+        result = {}
+        if (order_number := get("order_number")) is not None:
+            result["externalOrderId"] = order_number
+        result["productCategory"] = get("vertical", "").upper()
+        if (product_type := get("product_type")) is not None:
+            result["productType"] = product_type
+        result["source"] = "QUALIA_MARKETPLACE"
+        result["state"] = self._state_from_properties(props)
+        result["properties"] = self._format_properties(props)
+        result["agency"] = {"agencyName": get("customer_name", "")}
+        if (due_date := get("due_date")) is not None:
+            result["dueDate"] = due_date
+        result["notes"] = ""
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transformed data fields: %s", list(result))
         return result
 
     def _extract_state(self, data):
         """Extract state information from property data."""
-        addr = data.get("properties", [{}])[0]
-        state_code = addr.get("state")
+        return self._state_from_properties(data.get("properties") or [])
+
+    def _extract_properties(self, data):
+        """Extract and format property addresses."""
+        return self._format_properties(data.get("properties") or [])
+
+    def _state_from_properties(self, props):
+        """Build state information from the first property."""
+        state_code = props[0].get("state") if props else None
+        state_name = _lookup_state(state_code) if state_code else ""
+        if state_code and not state_name:
+            logger.warning("Unknown state code: %s", state_code)
         return {
             "stateCode": state_code,
-            "stateName": self._state_name(state_code)
+            "stateName": state_name
         }
 
-    def _extract_properties(self, data):
-        """Extract and format property addresses."""
-        props = data.get("properties", [])
+    def _format_properties(self, props):
+        """Format property addresses."""
         return [{
             "address": {
                 "addressLine1": p.get("address_1"),
@@ -76,7 +100,7 @@ class QualiaToInternalAdapter:
         """Get full state name from state code."""
         if not code:
             return ""
-        state_name = self.STATE_NAMES.get(code.upper(), "")
+        state_name = _lookup_state(code)
         if not state_name:
-            logger.warning(f"Unknown state code: {code}")
+            logger.warning("Unknown state code: %s", code)
         return state_name
\ No newline at end of file
@@ -2,9 +2,14 @@
 import boto3
 import logging
 import os
+import threading
+import time
 from botocore.exceptions import ClientError
+from config.aws import dynamodb_config
 from config.settings import settings
-from datetime import datetime
+from utils.timeutils import iso_from_ns
+from functools import lru_cache
+from operator import itemgetter
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -13,37 +18,60 @@ logger = logging.getLogger(__name__)
 USE_LOCALSTACK = os.getenv('USE_LOCALSTACK', 'false').lower() == 'true'
 LOCALSTACK_ENDPOINT = os.getenv('LOCALSTACK_ENDPOINT', 'http://localhost:4566')
 
-if USE_LOCALSTACK:
-    logger.info(f"Using LocalStack DynamoDB at {LOCALSTACK_ENDPOINT}")
-    dynamodb = boto3.resource(
-        'dynamodb',
-        region_name=settings.AWS_REGION,
-        endpoint_url=LOCALSTACK_ENDPOINT
-    )
-else:
-    logger.info(f"Using AWS DynamoDB in region {settings.AWS_REGION}")
-    dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
-
-table = dynamodb.Table(settings.DYNAMODB_TABLE)
-
-def put_metadata(order_id: str, status: str, extra: dict = None):
-    """Store or update order metadata in DynamoDB."""
+@lru_cache()
+def get_table():
+    """Get the DynamoDB table, creating the resource on first use."""
+    if USE_LOCALSTACK:
+        logger.info("Using LocalStack DynamoDB at %s", LOCALSTACK_ENDPOINT)
+        dynamodb = boto3.resource(
+            'dynamodb',
+            region_name=settings.AWS_REGION,
+            endpoint_url=LOCALSTACK_ENDPOINT,
+            config=dynamodb_config
+        )
+    else:
+        logger.info("Using AWS DynamoDB in region %s", settings.AWS_REGION)
+        dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION, config=dynamodb_config)
+
+    return dynamodb.Table(settings.DYNAMODB_TABLE)
+
+# put_item responses are never read, so ask DynamoDB not to build them
+_NO_RETURN = {'ReturnValues': 'NONE', 'ReturnConsumedCapacity': 'NONE'}
+
+def _metadata_item(order_id: str, status: str, extra: dict = None, now_ns: int = None):
+    """Build the DynamoDB item for an order metadata update."""
+    now_ns = now_ns or time.time_ns()
     item = {
         'orderId': order_id,
-        'timestamp': int(datetime.utcnow().timestamp() * 1000),
+        'timestamp': now_ns // 1_000_000,
         'status': status,
-        'notified_at': datetime.utcnow().isoformat() + "Z",
-        **(extra or {})
+        'notified_at': iso_from_ns(now_ns)
     }
+    if extra:
+        item.update(extra)
+    return item
+
+def put_metadata(order_id: str, status: str, extra: dict = None, if_absent: bool = False):
+    """Store or update order metadata in DynamoDB.
+
+    With if_absent=True the write only happens when the order has no item yet,
+    so a retried webhook can't reset a later status back to NOTIFIED.
+    """
+    item = _metadata_item(order_id, status, extra)
+    condition = {"ConditionExpression": "attribute_not_exists(orderId)"} if if_absent else {}
     try:
-        table.put_item(Item=item)
-        logger.info(f"Updated order {order_id} status to {status}", extra={
-            "order_id": order_id,
-            "status": status,
-            "metadata": extra
-        })
+        get_table().put_item(Item=item, **condition, **_NO_RETURN)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Updated order %s status to %s", order_id, status, extra={
+                "order_id": order_id,
+                "status": status,
+                "metadata": extra
+            })
     except ClientError as e:
-        logger.error(f"DynamoDB write failed for order {order_id}: {str(e)}", extra={
+        if if_absent and e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            logger.debug("Order %s already exists; %s write skipped", order_id, status)
+            return
+        logger.error("DynamoDB write failed for order %s: %s", order_id, e, extra={
             "order_id": order_id,
             "status": status,
             "error": str(e),
@@ -51,6 +79,58 @@ def put_metadata(order_id: str, status: str, extra: dict = None):
         })
         raise RuntimeError(f"DynamoDB write failed: {e}")
 
+def batch_put_metadata(updates: list):
+    """Store or update metadata for several orders with BatchWriteItem.
+
+    Args:
+        updates: List of dicts with order_id, status and optional extra keys
+
+    The batch writer sends up to 25 items per request and resubmits any
+    UnprocessedItems returned by DynamoDB.
+    """
+    order_ids = [u['order_id'] for u in updates]
+    now_ns = time.time_ns()
+    try:
+        with get_table().batch_writer(overwrite_by_pkeys=['orderId']) as batch:
+            for update in updates:
+                batch.put_item(Item=_metadata_item(update['order_id'], update['status'], update.get('extra'), now_ns))
+        logger.info("Updated metadata for %s orders", len(updates), extra={
+            "order_ids": order_ids
+        })
+    except ClientError as e:
+        logger.error("DynamoDB batch write failed for %s orders: %s", len(updates), e, extra={
+            "order_ids": order_ids,
+            "error": str(e),
+            "error_code": e.response.get('Error', {}).get('Code')
+        })
+        raise RuntimeError(f"DynamoDB batch write failed: {e}")
+
+_activity_fields = itemgetter('order_id', 'activity_type', 'description')
+
+def _activity_item(activity_data: dict, now_ns: int = None):
+    """Build the DynamoDB item for an activity notification."""
+    order_id, activity_type, description = _activity_fields(activity_data)
+    now_ns = now_ns or time.time_ns()
+    timestamp_ms = now_ns // 1_000_000
+
+    # Create composite key for activities
+    item = {
+        'PK': f"ACTIVITY#{order_id}",
+        'SK': f"{activity_type}#{timestamp_ms}",
+        'orderId': order_id,
+        'activityType': activity_type,
+        'description': description,
+        'timestamp': timestamp_ms,
+        'receivedAt': iso_from_ns(now_ns)
+    }
+
+    # Add message_id if present
+    message_id = activity_data.get('message_id')
+    if message_id:
+        item['messageId'] = message_id
+
+    return item
+
 def store_activity(activity_data: dict):
     """Store Qualia activity notification in DynamoDB.
 
@@ -61,34 +141,17 @@ def store_activity(activity_data: dict):
             - description: Human-readable description
             - message_id: Message ID (optional, only for message type)
     """
-    # Create composite key for activities
-    pk = f"ACTIVITY#{activity_data['order_id']}"
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-    sk = f"{activity_data['activity_type']}#{timestamp_ms}"
-
-    item = {
-        'PK': pk,
-        'SK': sk,
-        'orderId': activity_data['order_id'],
-        'activityType': activity_data['activity_type'],
-        'description': activity_data['description'],
-        'timestamp': timestamp_ms,
-        'receivedAt': datetime.utcnow().isoformat() + "Z"
-    }
-
-    # Add message_id if present
-    if activity_data.get('message_id'):
-        item['messageId'] = activity_data['message_id']
+    item = _activity_item(activity_data)
 
     try:
-        table.put_item(Item=item)
-        logger.info(f"Stored {activity_data['activity_type']} activity for order {activity_data['order_id']}", extra={
+        get_table().put_item(Item=item, **_NO_RETURN)
+        logger.info("Stored %s activity for order %s", activity_data['activity_type'], activity_data['order_id'], extra={
             "order_id": activity_data['order_id'],
             "activity_type": activity_data['activity_type'],
             "message_id": activity_data.get('message_id')
         })
     except ClientError as e:
-        logger.error(f"DynamoDB write failed for activity: {str(e)}", extra={
+        logger.error("DynamoDB write failed for activity: %s", e, extra={
             "order_id": activity_data['order_id'],
             "activity_type": activity_data['activity_type'],
             "error": str(e),
@@ -96,24 +159,12 @@ def store_activity(activity_data: dict):
         })
         raise RuntimeError(f"DynamoDB write failed: {e}")
 
-def store_message(message_data: dict):
-    """Store Qualia message in DynamoDB.
-
-    Args:
-        message_data: Dictionary containing message information including:
-            - order_id: Order ID
-            - message_id: Unique message ID
-            - message_type: Type of message (message.received or message.sent)
-            - from_name: Sender name
-            - text: Message content
-            - created_date: Message creation timestamp
-            - read: Read status
-            - attachments: List of attachments (optional)
-            - order_number: Order number (optional)
-    """
+def _message_item(message_data: dict, now_ns: int = None):
+    """Build the DynamoDB item for a Qualia message."""
     # Create composite key: order_id + message_id
     pk = f"MESSAGE#{message_data['order_id']}"
     sk = f"{message_data['message_type']}#{message_data['message_id']}"
+    now_ns = now_ns or time.time_ns()
 
     item = {
         'PK': pk,
@@ -125,8 +176,8 @@ def store_message(message_data: dict):
         'text': message_data['text'],
         'createdDate': message_data['created_date'],
         'read': message_data.get('read', False),
-        'timestamp': int(datetime.utcnow().timestamp() * 1000),
-        'storedAt': datetime.utcnow().isoformat() + "Z"
+        'timestamp': now_ns // 1_000_000,
+        'storedAt': iso_from_ns(now_ns)
     }
 
     # Add optional fields
@@ -136,15 +187,35 @@ def store_message(message_data: dict):
     if message_data.get('attachments'):
         item['attachments'] = message_data['attachments']
 
+    return item
+
+def store_message(message_data: dict):
+    """Store Qualia message in DynamoDB.
+
+    Args:
+        message_data: Dictionary containing message information including:
+            - order_id: Order ID
+            - message_id: Unique message ID
+            - message_type: Type of message (message.received or message.sent)
+            - from_name: Sender name
+            - text: Message content
+            - created_date: Message creation timestamp
+            - read: Read status
+            - attachments: List of attachments (optional)
+            - order_number: Order number (optional)
+    """
+    item = _message_item(message_data)
+
     try:
-        table.put_item(Item=item)
-        logger.info(f"Stored message {message_data['message_id']} for order {message_data['order_id']}", extra={
+        get_table().put_item(Item=item, **_NO_RETURN)
+        _invalidate_messages(message_data['order_id'])
+        logger.info("Stored message %s for order %s", message_data['message_id'], message_data['order_id'], extra={
             "order_id": message_data['order_id'],
             "message_id": message_data['message_id'],
             "message_type": message_data['message_type']
         })
     except ClientError as e:
-        logger.error(f"DynamoDB write failed for message {message_data['message_id']}: {str(e)}", extra={
+        logger.error("DynamoDB write failed for message %s: %s", message_data['message_id'], e, extra={
             "order_id": message_data['order_id'],
             "message_id": message_data['message_id'],
             "error": str(e),
@@ -152,49 +223,192 @@ def store_message(message_data: dict):
         })
         raise RuntimeError(f"DynamoDB write failed: {e}")
 
-def get_messages_by_order(order_id: str, message_type: str = None):
-    """Retrieve messages for a specific order from DynamoDB.
+def store_activity_with_message(activity_data: dict, message_data: dict):
+    """Store an activity notification and its message in one BatchWriteItem.
+
+    Args:
+        activity_data: Activity information, as for store_activity
+        message_data: Message information, as for store_message
+    """
+    now_ns = time.time_ns()
+    try:
+        with get_table().batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+            batch.put_item(Item=_activity_item(activity_data, now_ns))
+            batch.put_item(Item=_message_item(message_data, now_ns))
+        _invalidate_messages(message_data['order_id'])
+        logger.info("Stored %s activity and message %s for order %s", activity_data['activity_type'], message_data['message_id'], activity_data['order_id'], extra={
+            "order_id": activity_data['order_id'],
+            "activity_type": activity_data['activity_type'],
+            "message_id": message_data['message_id']
+        })
+    except ClientError as e:
+        logger.error("DynamoDB batch write failed for activity and message %s: %s", message_data['message_id'], e, extra={
+            "order_id": activity_data['order_id'],
+            "message_id": message_data['message_id'],
+            "error": str(e),
+            "error_code": e.response.get('Error', {}).get('Code')
+        })
+        raise RuntimeError(f"DynamoDB batch write failed: {e}")
+
+# Recent get_messages_by_order results per order: {order_id: {(message_type, projection): (expires_at, items)}}.
+# Writes through this module drop the order's entries; other Lambda instances
+# may serve results up to MESSAGE_CACHE_TTL seconds old.
+_MESSAGE_CACHE_MAXSIZE = 4096
+_message_cache = {}
+_message_cache_lock = threading.Lock()
+
+def _cached_messages(order_id: str, key: tuple):
+    """Return a copy of the cached messages for an order, or None on a miss."""
+    with _message_cache_lock:
+        entry = _message_cache.get(order_id, {}).get(key)
+        if entry is None:
+            return None
+        expires_at, items = entry
+        if expires_at < time.monotonic():
+            del _message_cache[order_id][key]
+            return None
+        # Re-insert so the least recently used order is evicted first
+        _message_cache[order_id] = _message_cache.pop(order_id)
+        return list(items)
+
+def _cache_messages(order_id: str, key: tuple, items: list):
+    """Cache a copy of the messages for an order."""
+    with _message_cache_lock:
+        if order_id not in _message_cache and len(_message_cache) >= _MESSAGE_CACHE_MAXSIZE:
+            del _message_cache[next(iter(_message_cache))]
+        _message_cache.setdefault(order_id, {})[key] = (time.monotonic() + settings.MESSAGE_CACHE_TTL, list(items))
+
+def _invalidate_messages(order_id: str):
+    """Drop all cached message lookups for an order."""
+    with _message_cache_lock:
+        _message_cache.pop(order_id, None)
+
+# Key conditions are plain strings: boto3 sends them as-is, whereas
+# boto3.dynamodb.conditions.Key objects are rebuilt into strings on every call
+_PK_ONLY = 'PK = :pk'
+_PK_AND_SK_PREFIX = 'PK = :pk AND begins_with(SK, :sk_prefix)'
+
+def _messages_query(order_id: str, message_type: str = None, projection: list = None):
+    """Build Query kwargs for an order's messages."""
+    pk = f"MESSAGE#{order_id}"
+
+    if message_type:
+        # Query with message type filter
+        query = {
+            'KeyConditionExpression': _PK_AND_SK_PREFIX,
+            'ExpressionAttributeValues': {
+                ':pk': pk,
+                ':sk_prefix': message_type
+            }
+        }
+    else:
+        # Query all messages for the order
+        query = {
+            'KeyConditionExpression': _PK_ONLY,
+            'ExpressionAttributeValues': {
+                ':pk': pk
+            }
+        }
+
+    if projection:
+        # Placeholders avoid collisions with DynamoDB reserved words (e.g. "text")
+        query['Select'] = 'SPECIFIC_ATTRIBUTES'
+        query['ProjectionExpression'] = ','.join(f'#a{i}' for i in range(len(projection)))
+        query['ExpressionAttributeNames'] = {f'#a{i}': name for i, name in enumerate(projection)}
+
+    return query
+
+def iter_messages_by_order(order_id: str, message_type: str = None, projection: list = None):
+    """Yield messages for a specific order, following DynamoDB pagination.
+
+    Args:
+        order_id: The order ID to retrieve messages for
+        message_type: Optional message type filter (message.received or message.sent)
+        projection: Optional attribute names to return (e.g. ['messageId', 'createdDate']);
+            all attributes are returned when omitted
+
+    Yields:
+        Message items, one query page (up to 1 MB) at a time
+    """
+    query = _messages_query(order_id, message_type, projection)
+
+    table = get_table()
+    while True:
+        try:
+            response = table.query(**query)
+        except ClientError as e:
+            logger.error("DynamoDB query failed for order %s: %s", order_id, e, extra={
+                "order_id": order_id,
+                "error": str(e),
+                "error_code": e.response.get('Error', {}).get('Code')
+            })
+            raise RuntimeError(f"DynamoDB query failed: {e}")
+
+        yield from response.get('Items', [])
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        query['ExclusiveStartKey'] = last_key
+
+def get_messages_by_order(order_id: str, message_type: str = None, projection: list = None):
+    """Retrieve all messages for a specific order from DynamoDB.
 
     Args:
         order_id: The order ID to retrieve messages for
         message_type: Optional message type filter (message.received or message.sent)
+        projection: Optional attribute names to return; all attributes when omitted
 
     Returns:
-        List of message items
+        List of message items across all query pages
+
+    Results are cached in memory for MESSAGE_CACHE_TTL seconds.
     """
-    pk = f"MESSAGE#{order_id}"
+    use_cache = settings.MESSAGE_CACHE_TTL > 0
+    cache_key = (message_type, tuple(projection) if projection else None)
+    if use_cache:
+        messages = _cached_messages(order_id, cache_key)
+        if messages is not None:
+            return messages
 
-    try:
-        if message_type:
-            # Query with message type filter
-            response = table.query(
-                KeyConditionExpression='PK = :pk AND begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':pk': pk,
-                    ':sk_prefix': message_type
-                }
-            )
-        else:
-            # Query all messages for the order
-            response = table.query(
-                KeyConditionExpression='PK = :pk',
-                ExpressionAttributeValues={
-                    ':pk': pk
-                }
-            )
-
-        messages = response.get('Items', [])
-        logger.info(f"Retrieved {len(messages)} messages for order {order_id}", extra={
-            "order_id": order_id,
-            "message_type": message_type,
-            "count": len(messages)
-        })
-        return messages
+    messages = list(iter_messages_by_order(order_id, message_type, projection))
+    if use_cache:
+        _cache_messages(order_id, cache_key, messages)
+    logger.info("Retrieved %s messages for order %s", len(messages), order_id, extra={
+        "order_id": order_id,
+        "message_type": message_type,
+        "count": len(messages)
+    })
+    return messages
+
+def get_messages_page(order_id: str, message_type: str = None, limit: int = None,
+                      start_key: dict = None, projection: list = None):
+    """Retrieve one page of messages for an order.
 
+    Args:
+        order_id: The order ID to retrieve messages for
+        message_type: Optional message type filter (message.received or message.sent)
+        limit: Maximum number of items DynamoDB evaluates for this page
+        start_key: LastEvaluatedKey returned by the previous page
+        projection: Optional attribute names to return; all attributes when omitted
+
+    Returns:
+        Tuple of (message items, LastEvaluatedKey or None when there are no more pages)
+    """
+    query = _messages_query(order_id, message_type, projection)
+    if limit is not None:
+        query['Limit'] = limit
+    if start_key:
+        query['ExclusiveStartKey'] = start_key
+
+    try:
+        response = get_table().query(**query)
     except ClientError as e:
-        logger.error(f"DynamoDB query failed for order {order_id}: {str(e)}", extra={
+        logger.error("DynamoDB query failed for order %s: %s", order_id, e, extra={
             "order_id": order_id,
             "error": str(e),
             "error_code": e.response.get('Error', {}).get('Code')
         })
-        raise RuntimeError(f"DynamoDB query failed: {e}")
\ No newline at end of file
+        raise RuntimeError(f"DynamoDB query failed: {e}")
+
+    return response.get('Items', []), response.get('LastEvaluatedKey')
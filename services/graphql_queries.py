@@ -1,10 +1,41 @@
 # services/graphql_queries.py
 """GraphQL queries for Qualia API."""
+import hashlib
+import re
+
+
+def _minify(query: str) -> str:
+    """Collapse whitespace so each request carries a compact query string."""
+    return re.sub(r"\s+", " ", query).strip()
+
+
+# Selection shared by the order queries and the status-changing mutations
+STATUS_DETAILS = """
+status_details {
+  open
+  pending
+  accepted
+  declined
+  cancelled
+  submitted
+  revision_required
+  completed
+  resubmitted
+  resubmission_accepted
+  preorder
+  cancellation_reason
+  cancelled_by
+  revision_required_reason
+  created_date
+  closed_date
+}
+"""
+
 # queries
-GET_ORDERS_QUERY = """
-query orders($input: OrdersInput) {
-    orders(input: $input) {
-        orders {
+GET_ORDERS_QUERY = _minify(f"""
+query orders($input: OrdersInput) {{
+    orders(input: $input) {{
+        orders {{
             _id
             product_name
             product_description
@@ -18,24 +49,7 @@ query orders($input: OrdersInput) {
             customer_id
             customer_order_id
             status
-            status_details {
-                open
-                pending
-                accepted
-                declined
-                cancelled
-                submitted
-                revision_required
-                completed
-                resubmitted
-                resubmission_accepted
-                preorder
-                cancellation_reason
-                cancelled_by
-                revision_required_reason
-                created_date
-                closed_date
-            }
+            {STATUS_DETAILS}
             quoted_price
             quoted_qualia_fee
             price
@@ -44,7 +58,7 @@ query orders($input: OrdersInput) {
             charged_at_beginning
             due_date
             projected_close_date
-            properties {
+            properties {{
                 address_1
                 address_2
                 city
@@ -52,16 +66,16 @@ query orders($input: OrdersInput) {
                 zipcode
                 county
                 flat_address
-            }
-            credentials {
+            }}
+            credentials {{
                 placeholder
-            }
-        }
-    }
-}
-"""
+            }}
+        }}
+    }}
+}}
+""")
 
-GET_ORDER_QUERY = """
+GET_ORDER_QUERY = _minify("""
 query GetOrder($input: ID!) {
   order(_id: $input) {
     order {
@@ -292,9 +306,9 @@ query GetOrder($input: ID!) {
     outstanding_tasks
   }
 }
-"""
+""")
 
-GET_MESSAGES_LIST_QUERY = """
+GET_MESSAGES_LIST_QUERY = _minify("""
 query Messages {
     messages {
         order_id
@@ -312,132 +326,64 @@ query Messages {
         }
     }
 }
-"""
+""")
 
 
 
 # mutations
-ACCEPT_ORDER_MUTATION = """
-mutation acceptOrder($input: AcceptOrderInput) {
-  acceptOrder(input: $input) {
+ACCEPT_ORDER_MUTATION = _minify(f"""
+mutation acceptOrder($input: AcceptOrderInput) {{
+  acceptOrder(input: $input) {{
     status
-    status_details {
-      open
-      pending
-      accepted
-      declined
-      cancelled
-      submitted
-      revision_required
-      completed
-      resubmitted
-      resubmission_accepted
-      preorder
-      cancellation_reason
-      cancelled_by
-      revision_required_reason
-      created_date
-      closed_date
-    }
-  }
-}
-"""
+    {STATUS_DETAILS}
+  }}
+}}
+""")
 
-CANCEL_ORDER_MUTATION = """
-mutation cancelOrder($input: CancelOrderInput) {
-  cancelOrder(input: $input) {
+CANCEL_ORDER_MUTATION = _minify(f"""
+mutation cancelOrder($input: CancelOrderInput) {{
+  cancelOrder(input: $input) {{
     status
-    status_details {
-      open
-      pending
-      accepted
-      declined
-      cancelled
-      submitted
-      revision_required
-      completed
-      resubmitted
-      resubmission_accepted
-      preorder
-      cancellation_reason
-      cancelled_by
-      revision_required_reason
-      created_date
-      closed_date
-    }
-  }
-}
-"""
+    {STATUS_DETAILS}
+  }}
+}}
+""")
 
-DECLINE_ORDER_MUTATION = """
-mutation declineOrder($input: DeclineOrderInput) {
-  declineOrder(input: $input) {
+DECLINE_ORDER_MUTATION = _minify(f"""
+mutation declineOrder($input: DeclineOrderInput) {{
+  declineOrder(input: $input) {{
     status
-    status_details {
-      open
-      pending
-      accepted
-      declined
-      cancelled
-      submitted
-      revision_required
-      completed
-      resubmitted
-      resubmission_accepted
-      preorder
-      cancellation_reason
-      cancelled_by
-      revision_required_reason
-      created_date
-      closed_date
-    }
-  }
-}
-"""
+    {STATUS_DETAILS}
+  }}
+}}
+""")
 
-SUBMIT_ORDER_MUTATION = """
-mutation submitOrder($input: SubmitOrderInput) {
-  submitOrder(input: $input) {
+SUBMIT_ORDER_MUTATION = _minify(f"""
+mutation submitOrder($input: SubmitOrderInput) {{
+  submitOrder(input: $input) {{
     status
-    status_details {
-      open
-      pending
-      accepted
-      declined
-      cancelled
-      submitted
-      revision_required
-      completed
-      resubmitted
-      resubmission_accepted
-      preorder
-      cancellation_reason
-      cancelled_by
-      revision_required_reason
-      created_date
-      closed_date
-    }
-  }
-}
-"""
+    {STATUS_DETAILS}
+  }}
+}}
+""")
 
-SEND_MESSAGE_MUTATION = """
+SEND_MESSAGE_MUTATION = _minify("""
 mutation sendMessage($input: MessageInput) {
   sendMessage(input: $input) {
     success
   }
 }
-"""
+""")
 
-ADD_FILE_MUTATION = """
+ADD_FILE_MUTATION = _minify("""
 mutation addFiles($input: AddFilesInput) {
   addFiles(input: $input) {
     outstanding_tasks
   }
 }
-"""
+""")
 
-REMOVE_FILE_MUTATION = """
+REMOVE_FILE_MUTATION = _minify("""
 mutation removeFiles($input: RemoveFilesInput) {
   removeFiles(input: $input) {
     order {
@@ -463,13 +409,21 @@ mutation removeFiles($input: RemoveFilesInput) {
     outstanding_tasks
   }
 }
-"""
+""")
 
 
-FULL_FILL_TITLE_SEARCH_MUTATION = """
+FULL_FILL_TITLE_SEARCH_MUTATION = _minify("""
 mutation fulfillTitleSearchPlus($input: TitleSearchPlusInput) {
   fulfillTitleSearchPlus(input: $input) {
     outstanding_tasks
   }
 }
-"""
+""")
+
+
+# Automatic Persisted Queries: name -> (sha256 hex of the minified document, document)
+QUERY_REGISTRY = {
+    name: (hashlib.sha256(query.encode("utf-8")).hexdigest(), query)
+    for name, query in list(globals().items())
+    if name.endswith(("_QUERY", "_MUTATION")) and isinstance(query, str)
+}
@@ -1,8 +1,14 @@
 # services/qualia_client.py
+import orjson
 import requests
 import time
+import threading
 import random
 import logging
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
 from requests.adapters import HTTPAdapter
 from config.settings import settings
 from services.graphql_queries import (
@@ -16,14 +22,68 @@ from services.graphql_queries import (
     SEND_MESSAGE_MUTATION,
     ADD_FILE_MUTATION,
     REMOVE_FILE_MUTATION,
-    FULL_FILL_TITLE_SEARCH_MUTATION
+    FULL_FILL_TITLE_SEARCH_MUTATION,
+    QUERY_REGISTRY
 )
 
 logger = logging.getLogger(__name__)
 
+# Persisted-query hash for each GraphQL document
+_QUERY_HASHES = {query: query_hash for query_hash, query in QUERY_REGISTRY.values()}
+
+# Pre-serialized '{"query":"..."' prefix for each GraphQL document
+_QUERY_PREFIXES = {query: b'{"query":' + orjson.dumps(query) for _, query in QUERY_REGISTRY.values()}
+
+def _encode_payload(payload: dict, extensions: dict = None) -> bytes:
+    """Serialize a GraphQL payload, reusing the pre-serialized query literal."""
+    query = payload["query"]
+    prefix = _QUERY_PREFIXES.get(query) or b'{"query":' + orjson.dumps(query)
+    body = [prefix]
+    variables = payload.get("variables")
+    if variables is not None:
+        body += (b',"variables":', orjson.dumps(variables))
+    if extensions:
+        body += (b',"extensions":', orjson.dumps(extensions))
+    body.append(b'}')
+    return b''.join(body)
+
+# Status codes that retrying cannot fix; mutations also treat 400 as permanent
+_PERMANENT_STATUSES = frozenset({401, 403, 404})
+_PERMANENT_MUTATION_STATUSES = frozenset({400, 401, 403, 404})
+
+# Upper bound in seconds for a single backoff sleep
+_BACKOFF_CAP = 30
+# Upper bound of the random delay added on top of the exponential wait
+_BACKOFF_JITTER = 2
+# Module-level generator so backoff jitter doesn't share the global random state
+_rng = random.Random()
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff for the given zero-based attempt, plus jitter so callers don't retry in lockstep."""
+    return min(_BACKOFF_CAP, 2 ** attempt) + _rng.uniform(0, _BACKOFF_JITTER)
+
+def _retry_after(resp) -> float:
+    """Seconds the server asked us to wait via Retry-After (delta-seconds or HTTP-date), else 0."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return 0.0
+    try:
+        return min(_BACKOFF_CAP, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        return min(_BACKOFF_CAP, max(0.0, parsedate_to_datetime(value).timestamp() - time.time()))
+    except (TypeError, ValueError):
+        return 0.0
+
 class QualiaClient:
     """Client for Qualia API with connection pooling and retry logic."""
 
+    # Seconds to reuse a get_messages_list response
+    MESSAGES_CACHE_TTL = 2
+    # How many get_order/get_orders results to keep (TTL: settings.QUALIA_READ_CACHE_TTL)
+    READ_CACHE_MAXSIZE = 1024
+
     def __init__(self):
         self.base_url = "https://api.qualia.com/v1"
         self.graphql_url = "https://qa-marketplace.qualia.io/api/vendor/graphql"
@@ -41,70 +101,258 @@ class QualiaClient:
         )
         self.session.mount('https://', adapter)
         self.session.headers.update(self.headers)
+        # Short-lived cache for get_messages_list
+        self._messages_cache = None
+        self._messages_cached_at = 0.0
+        self._messages_lock = threading.Lock()
+        # LRU of (query, variables) -> (expires_at, data) for idempotent reads
+        self._read_cache = OrderedDict()
+        self._read_cache_ttl = settings.QUALIA_READ_CACHE_TTL
+        self._read_lock = threading.Lock()
+        # Read queries over GET, with the last ETag and body per (query, variables)
+        self._get_reads = settings.QUALIA_GET_READS
+        self._etags = OrderedDict()
+        # Futures for requests in flight, shared by concurrent callers with the same key
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Automatic Persisted Queries; switched off if the server reports no support
+        self._persisted_queries = settings.QUALIA_PERSISTED_QUERIES
+        if settings.QUALIA_WARMUP:
+            threading.Thread(target=self.warmup, daemon=True).start()
+
+    def warmup(self):
+        """Best-effort HEAD request so the TCP/TLS handshake happens before the first real call."""
+        try:
+            self.session.head(self.graphql_url, timeout=5)
+        except requests.exceptions.RequestException as e:
+            logger.debug("Qualia connection warmup failed: %s", e)
+
+    def _single_flight(self, key, fn):
+        """Run fn() once for concurrent callers with the same key; the rest wait for its outcome."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
 
-    def download_order(self, order_id: str, max_retries: int = 5):
-        """Download order details from Qualia API with retry logic."""
-        url = f"{self.graphql_url}/orders/{order_id}"
-        logger.info(f"Downloading order {order_id} from Qualia API", extra={
-            "order_id": order_id,
-            "url": url
-        })
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _post_graphql(self, payload: dict, timeout: int = 30):
+        """POST a GraphQL payload, sending only its persisted-query hash when enabled.
+
+        Falls back to the full document when the server doesn't know the hash
+        yet (registering it), and disables APQ for this client if the server
+        doesn't support persisted queries at all.
+        """
+        query_hash = _QUERY_HASHES.get(payload.get("query")) if self._persisted_queries else None
+        if query_hash is None:
+            return self.session.post(self.graphql_url, data=_encode_payload(payload), timeout=timeout)
+
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+        hashed = {k: v for k, v in payload.items() if k != "query"}
+        hashed["extensions"] = extensions
+        resp = self.session.post(self.graphql_url, data=orjson.dumps(hashed), timeout=timeout)
+
+        body = resp.content
+        if b"PERSISTED_QUERY_NOT_SUPPORTED" in body or b"PersistedQueryNotSupported" in body:
+            logger.warning("Qualia GraphQL API does not support persisted queries; sending full documents")
+            self._persisted_queries = False
+        elif not (b"PERSISTED_QUERY_NOT_FOUND" in body or b"PersistedQueryNotFound" in body):
+            return resp
+
+        return self.session.post(self.graphql_url, data=_encode_payload(payload, extensions), timeout=timeout)
+
+    def _get_graphql(self, payload: dict, timeout: int = 30):
+        """GET a read-only GraphQL payload, revalidating with If-None-Match when an ETag is known."""
+        params = {"query": payload["query"], "variables": orjson.dumps(payload.get("variables")).decode()}
+        with self._read_lock:
+            known = self._etags.get(self._read_key(payload))
+        headers = {"If-None-Match": known[0]} if known else None
+        return self.session.get(self.graphql_url, params=params, headers=headers, timeout=timeout)
+
+    def _etag_body(self, payload: dict, resp) -> bytes:
+        """Return the body for a GET read, reusing the stored body on 304 Not Modified."""
+        key = self._read_key(payload)
+        with self._read_lock:
+            if resp.status_code == 304:
+                self._etags.move_to_end(key)
+                return self._etags[key][1]
+            etag = resp.headers.get("ETag")
+            if etag:
+                self._etags[key] = (etag, resp.content)
+                self._etags.move_to_end(key)
+                if len(self._etags) > self.READ_CACHE_MAXSIZE:
+                    self._etags.popitem(last=False)
+        return resp.content
+
+    @staticmethod
+    def _read_key(payload: dict):
+        """Cache key for a read: the query plus its canonical variables."""
+        return payload["query"], orjson.dumps(payload.get("variables"), option=orjson.OPT_SORT_KEYS)
+
+    def _cached_read(self, key):
+        """Return the cached data for a read, or None on a miss."""
+        with self._read_lock:
+            entry = self._read_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._read_cache[key]
+                return None
+            self._read_cache.move_to_end(key)
+            return entry[1]
+
+    def _store_read(self, key, data: dict):
+        """Cache the data for a read, evicting the least recently used entry when full."""
+        if self._read_cache_ttl <= 0:
+            return
+        with self._read_lock:
+            self._read_cache[key] = (time.monotonic() + self._read_cache_ttl, data)
+            self._read_cache.move_to_end(key)
+            if len(self._read_cache) > self.READ_CACHE_MAXSIZE:
+                self._read_cache.popitem(last=False)
+
+    def invalidate_order(self, order_id: str):
+        """Drop cached reads for an order Qualia reports as changed (e.g. via an activity webhook)."""
+        self._invalidate_reads(order_id)
+
+    def _invalidate_reads(self, order_id: str):
+        """Drop cached reads a mutation of this order may have made stale."""
+        order_key = self._read_key({"query": GET_ORDER_QUERY, "variables": {"input": order_id}})
+        with self._read_lock:
+            # Any orders list may include the order, so those go too
+            for key in [k for k in self._read_cache if k[0] == GET_ORDERS_QUERY or k == order_key]:
+                del self._read_cache[key]
+
+    def _request_with_retry(self, send, label: str, log_extra: dict, max_retries: int = 5,
+                            permanent: frozenset = _PERMANENT_STATUSES):
+        """Call send() until it returns HTTP 200, backing off between attempts.
+
+        Args:
+            send: Zero-argument callable that performs one HTTP request
+            label: What is being requested, for log and error messages (e.g. "order QO-1")
+            log_extra: Structured-log fields shared by every message
+            max_retries: Maximum number of attempts
+            permanent: Status codes that fail immediately instead of retrying
 
+        Returns:
+            requests.Response: The successful response
+        """
         for attempt in range(max_retries):
             try:
-                resp = self.session.get(url, timeout=30)
+                resp = send()
+                status = resp.status_code
 
-                if resp.status_code == 200:
-                    logger.info(f"Successfully downloaded order {order_id}", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1
+                # 304 only answers our own conditional GETs; _etag_body supplies the body
+                if status == 200 or status == 304:
+                    return resp
+
+                if status in permanent:
+                    logger.error("Permanent error %s for %s", status, label, extra={
+                        **log_extra,
+                        "status_code": status,
+                        "response": resp.text
                     })
-                    return resp.json()
+                    raise RuntimeError(f"Permanent error {status}: {resp.text}")
 
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for order {order_id}, waiting {wait:.2f}s", extra={
-                        "order_id": order_id,
+                if attempt == max_retries - 1:
+                    # No retry follows, so don't sleep before giving up
+                    logger.warning("HTTP %s for %s on final attempt", status, label, extra={
+                        **log_extra,
+                        "status_code": status,
+                        "attempt": attempt + 1
+                    })
+                    break
+
+                wait = _backoff(attempt)
+                if status in (429, 503):
+                    # Never retry sooner than the server asked
+                    wait = max(wait, _retry_after(resp))
+                if status == 429:
+                    logger.warning("Rate limited for %s, waiting %.2fs", label, wait, extra={
+                        **log_extra,
                         "attempt": attempt + 1,
                         "wait_seconds": wait
                     })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for order {order_id}", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
                 else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for order {order_id}, retrying in {wait}s", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
+                    logger.warning("HTTP %s for %s, retrying in %.2fs", status, label, wait, extra={
+                        **log_extra,
+                        "status_code": status,
                         "attempt": attempt + 1,
                         "wait_seconds": wait
                     })
-                    time.sleep(wait)
+                time.sleep(wait)
 
             except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for order {order_id}: {str(e)}", extra={
-                    "order_id": order_id,
+                logger.error("Request exception for %s: %s", label, e, extra={
+                    **log_extra,
                     "attempt": attempt + 1,
                     "error": str(e)
                 })
                 if attempt == max_retries - 1:
                     raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
+                time.sleep(_backoff(attempt))
 
-        logger.error(f"Max retries exceeded for order {order_id}", extra={
-            "order_id": order_id,
+        logger.error("Max retries exceeded for %s", label, extra={
+            **log_extra,
             "max_retries": max_retries
         })
-        raise RuntimeError(f"Max retries exceeded for order {order_id}")
+        raise RuntimeError(f"Max retries exceeded for {label}")
+
+    def _execute_graphql(self, payload: dict, label: str, log_extra: dict, max_retries: int = 5,
+                         permanent: frozenset = _PERMANENT_STATUSES, read: bool = False):
+        """Send a GraphQL payload with retry logic and return its data, raising on GraphQL errors.
+
+        Read-only queries (read=True) go over GET when QUALIA_GET_READS is on;
+        everything else is POSTed.
+        """
+        if read and self._get_reads:
+            resp = self._request_with_retry(lambda: self._get_graphql(payload), label, log_extra, max_retries, permanent)
+            data = orjson.loads(self._etag_body(payload, resp))
+        else:
+            resp = self._request_with_retry(lambda: self._post_graphql(payload), label, log_extra, max_retries, permanent)
+            data = orjson.loads(resp.content)
+
+        # Check for GraphQL errors
+        if "errors" in data:
+            logger.error("GraphQL errors for %s", label, extra={
+                **log_extra,
+                "errors": data["errors"]
+            })
+            raise RuntimeError(f"GraphQL errors: {data['errors']}")
+
+        return data.get("data", {})
+
+    def download_order(self, order_id: str, max_retries: int = 5):
+        """Download order details from Qualia API with retry logic."""
+        url = f"{self.graphql_url}/orders/{order_id}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Downloading order %s from Qualia API", order_id, extra={
+                "order_id": order_id,
+                "url": url
+            })
+
+        def download():
+            resp = self._request_with_retry(
+                lambda: self.session.get(url, timeout=30), f"order {order_id}", {"order_id": order_id}, max_retries
+            )
+            logger.info("Successfully downloaded order %s", order_id, extra={"order_id": order_id})
+            return orjson.loads(resp.content)
+
+        # Duplicate deliveries of the same order in one batch share a single download
+        return self._single_flight(("download", order_id), download)
 
     def get_orders(self, filters: dict = None, max_retries: int = 5):
         """Get list of orders via Qualia GraphQL API with retry logic.
@@ -125,69 +373,20 @@ class QualiaClient:
             "variables": variables
         }
 
-        logger.info("Fetching orders list via Qualia GraphQL API", extra={
+        cache_key = self._read_key(payload)
+        cached = self._cached_read(cache_key)
+        if cached is not None:
+            return cached
+
+        logger.debug("Fetching orders list via Qualia GraphQL API", extra={
             "filters": filters
         })
 
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        logger.error("GraphQL errors for orders list", extra={
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-                    logger.info("Successfully fetched orders list", extra={
-                        "attempt": attempt + 1,
-                        "filters": filters
-                    })
-                    return data.get("data", {})
-
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for orders list, waiting {wait:.2f}s", extra={
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for orders list", extra={
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
-                else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for orders list, retrying in {wait}s", extra={
-                        "status_code": resp.status_code,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for orders list: {str(e)}", extra={
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
+        result = self._execute_graphql(payload, "orders list", {"filters": filters}, max_retries, read=True)
 
-        logger.error("Max retries exceeded for fetching orders list", extra={
-            "max_retries": max_retries
-        })
-        raise RuntimeError("Max retries exceeded for orders list")
+        logger.info("Successfully fetched orders list", extra={"filters": filters})
+        self._store_read(cache_key, result)
+        return result
 
     def get_order(self, order_id: str, max_retries: int = 5):
         """Get order details via Qualia GraphQL API with retry logic.
@@ -208,75 +407,22 @@ class QualiaClient:
             "variables": variables
         }
 
-        logger.info(f"Fetching order {order_id} via Qualia GraphQL API", extra={
+        cache_key = self._read_key(payload)
+        cached = self._cached_read(cache_key)
+        if cached is not None:
+            return cached
+
+        logger.debug("Fetching order %s via Qualia GraphQL API", order_id, extra={
             "order_id": order_id
         })
 
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        logger.error(f"GraphQL errors for order {order_id}", extra={
-                            "order_id": order_id,
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-                    logger.info(f"Successfully fetched order {order_id}", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1
-                    })
-                    return data.get("data", {})
-
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for order {order_id}, waiting {wait:.2f}s", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for order {order_id}", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
-                else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for order {order_id}, retrying in {wait}s", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for order {order_id}: {str(e)}", extra={
-                    "order_id": order_id,
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
+        def fetch():
+            result = self._execute_graphql(payload, f"order {order_id}", {"order_id": order_id}, max_retries, read=True)
+            logger.info("Successfully fetched order %s", order_id, extra={"order_id": order_id})
+            self._store_read(cache_key, result)
+            return result
 
-        logger.error(f"Max retries exceeded for fetching order {order_id}", extra={
-            "order_id": order_id,
-            "max_retries": max_retries
-        })
-        raise RuntimeError(f"Max retries exceeded for order {order_id}")
+        return self._single_flight(("order", order_id), fetch)
 
     def get_messages(self, filters: dict = None, max_retries: int = 5):
         """Get messages via Qualia GraphQL API with retry logic.
@@ -297,69 +443,14 @@ class QualiaClient:
             "variables": variables
         }
 
-        logger.info("Fetching messages via Qualia GraphQL API", extra={
+        logger.debug("Fetching messages via Qualia GraphQL API", extra={
             "filters": filters
         })
 
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        logger.error("GraphQL errors for messages", extra={
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-                    logger.info("Successfully fetched messages", extra={
-                        "attempt": attempt + 1,
-                        "filters": filters
-                    })
-                    return data.get("data", {})
-
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for messages, waiting {wait:.2f}s", extra={
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for messages", extra={
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
-                else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for messages, retrying in {wait}s", extra={
-                        "status_code": resp.status_code,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for messages: {str(e)}", extra={
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
+        result = self._execute_graphql(payload, "messages", {"filters": filters}, max_retries)
 
-        logger.error("Max retries exceeded for fetching messages", extra={
-            "max_retries": max_retries
-        })
-        raise RuntimeError("Max retries exceeded for messages")
+        logger.info("Successfully fetched messages", extra={"filters": filters})
+        return result
 
     def accept_order(self, order_id: str, max_retries: int = 5):
         """Accept an order via Qualia GraphQL API with retry logic.
@@ -377,71 +468,14 @@ class QualiaClient:
             }
         }
 
-        payload = {
-            "query": ACCEPT_ORDER_MUTATION,
-            "variables": variables
-        }
-
-        logger.info(f"Accepting order {order_id} via Qualia GraphQL API", extra={
-            "order_id": order_id
-        })
-
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        logger.error(f"GraphQL errors for order {order_id}", extra={
-                            "order_id": order_id,
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-                    logger.info(f"Successfully accepted order {order_id}", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1
-                    })
-                    return data.get("data", {})
-
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for order {order_id}, waiting {wait:.2f}s", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for order {order_id}", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
-                else:
-                    wait = 2 ** attempt
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for order {order_id}: {str(e)}", extra={
-                    "order_id": order_id,
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
-
-        logger.error(f"Max retries exceeded for accepting order {order_id}", extra={
-            "order_id": order_id,
-            "max_retries": max_retries
-        })
+        return self._execute_mutation(
+            mutation=ACCEPT_ORDER_MUTATION,
+            variables=variables,
+            order_id=order_id,
+            action="accepting",
+            max_retries=max_retries,
+            permanent=_PERMANENT_STATUSES
+        )
 
     def cancel_order(self, order_id: str, cancellation_reason: str = None, max_retries: int = 5):
         """Cancel an order via Qualia GraphQL API with retry logic.
@@ -463,81 +497,14 @@ class QualiaClient:
         if cancellation_reason:
             variables["input"]["cancellation_reason"] = cancellation_reason
 
-        payload = {
-            "query": CANCEL_ORDER_MUTATION,
-            "variables": variables
-        }
-
-        logger.info(f"Cancelling order {order_id} via Qualia GraphQL API", extra={
-            "order_id": order_id,
-            "cancellation_reason": cancellation_reason
-        })
-
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        logger.error(f"GraphQL errors for order {order_id}", extra={
-                            "order_id": order_id,
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-                    logger.info(f"Successfully cancelled order {order_id}", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1
-                    })
-                    return data.get("data", {})
-
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for order {order_id}, waiting {wait:.2f}s", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
-
-                elif resp.status_code in (401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for order {order_id}", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
-
-                else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for order {order_id}, retrying in {wait}s", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for order {order_id}: {str(e)}", extra={
-                    "order_id": order_id,
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
-
-        logger.error(f"Max retries exceeded for cancelling order {order_id}", extra={
-            "order_id": order_id,
-            "max_retries": max_retries
-        })
-        raise RuntimeError(f"Max retries exceeded for order {order_id}")
+        return self._execute_mutation(
+            mutation=CANCEL_ORDER_MUTATION,
+            variables=variables,
+            order_id=order_id,
+            action="cancelling",
+            max_retries=max_retries,
+            permanent=_PERMANENT_STATUSES
+        )
 
     def decline_order(self, order_id: str, decline_reason: str = None, max_retries: int = 5):
         """Decline an order via Qualia GraphQL API with retry logic."""
@@ -592,20 +559,39 @@ class QualiaClient:
             max_retries=max_retries
         )
 
-    def get_messages_list(self):
-        """Get messages for an order via Qualia GraphQL API with retry logic."""
+    def get_messages_list(self, force: bool = False):
+        """Get messages for an order via Qualia GraphQL API with retry logic.
+
+        Successful responses are cached for MESSAGES_CACHE_TTL seconds so a burst
+        of message notifications shares a single account-wide fetch. force=True
+        skips the cache, e.g. when a just-notified message isn't in the cached list.
+        """
+        if not force:
+            with self._messages_lock:
+                if (self._messages_cache is not None
+                        and time.monotonic() - self._messages_cached_at < self.MESSAGES_CACHE_TTL):
+                    return self._messages_cache
+        # Fetch outside the lock; concurrent misses share one request. Forced
+        # fetches don't join a cache-miss fetch that may predate the new message.
+        return self._single_flight(("messages_list", force), self._fetch_messages_list)
+
+    def _fetch_messages_list(self):
+        """Fetch the messages list and cache it; returns None on failure."""
         payload = {
             "query": GET_MESSAGES_LIST_QUERY
         }
         try:
-            resp = self.session.post(self.graphql_url, json=payload, timeout=30)
+            resp = self._post_graphql(payload)
             if resp.status_code == 200:
-                data = resp.json()
-                return data.get("data", {})
+                data = orjson.loads(resp.content).get("data", {})
+                with self._messages_lock:
+                    self._messages_cache = data
+                    self._messages_cached_at = time.monotonic()
+                return data
             else:
                 resp.raise_for_status()
         except Exception as e:
-            logger.error(f"Logging error while fetching messages: {str(e)}", extra={
+            logger.error("Logging error while fetching messages: %s", e, extra={
                 "error": str(e)
             })
 
@@ -667,84 +653,43 @@ class QualiaClient:
             max_retries=max_retries
         )
 
-    def _execute_mutation(self, mutation: str, variables: dict, order_id: str, action: str, max_retries: int = 5):
+    def _execute_mutation(self, mutation: str, variables: dict, order_id: str, action: str, max_retries: int = 5,
+                          permanent: frozenset = _PERMANENT_MUTATION_STATUSES):
         """Helper method to execute GraphQL mutations with retry logic."""
         payload = {
             "query": mutation,
             "variables": variables
         }
 
-        logger.info(f"{action.capitalize()} order {order_id} via Qualia GraphQL API", extra={
-            "order_id": order_id,
-            "action": action
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s order %s via Qualia GraphQL API", action.capitalize(), order_id, extra={
+                "order_id": order_id,
+                "action": action
+            })
 
-        for attempt in range(max_retries):
-            try:
-                resp = self.session.post(self.graphql_url, json=payload, timeout=30)
+        result = self._execute_graphql(payload, f"{action} order {order_id}", {"order_id": order_id}, max_retries, permanent)
 
-                if resp.status_code == 200:
-                    data = resp.json()
+        self._invalidate_reads(order_id)
+        logger.info("Successfully %s order %s", action, order_id, extra={"order_id": order_id})
+        return result
 
-                    if "errors" in data:
-                        logger.error(f"GraphQL errors for {action} order {order_id}", extra={
-                            "order_id": order_id,
-                            "errors": data["errors"]
-                        })
-                        raise RuntimeError(f"GraphQL errors: {data['errors']}")
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self.session.close()
 
-                    logger.info(f"Successfully {action} order {order_id}", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1
-                    })
-                    return data.get("data", {})
+    def __enter__(self):
+        return self
 
-                elif resp.status_code == 429:
-                    wait = (2 ** attempt) + random.uniform(0, 2)
-                    logger.warning(f"Rate limited for {action} order {order_id}, waiting {wait:.2f}s", extra={
-                        "order_id": order_id,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-                    continue
+    def __exit__(self, *exc_info):
+        self.close()
 
-                elif resp.status_code in (400, 401, 403, 404):
-                    logger.error(f"Permanent error {resp.status_code} for {action} order {order_id}", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "response": resp.text
-                    })
-                    raise RuntimeError(f"Permanent error {resp.status_code}: {resp.text}")
 
-                else:
-                    wait = 2 ** attempt
-                    logger.warning(f"HTTP {resp.status_code} for {action} order {order_id}, retrying in {wait}s", extra={
-                        "order_id": order_id,
-                        "status_code": resp.status_code,
-                        "attempt": attempt + 1,
-                        "wait_seconds": wait
-                    })
-                    time.sleep(wait)
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request exception for {action} order {order_id}: {str(e)}", extra={
-                    "order_id": order_id,
-                    "attempt": attempt + 1,
-                    "error": str(e)
-                })
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(wait)
+@lru_cache()
+def get_qualia_client() -> QualiaClient:
+    """Get cached QualiaClient instance so its connection pool is reused."""
+    return QualiaClient()
 
-        logger.error(f"Max retries exceeded for {action} order {order_id}", extra={
-            "order_id": order_id,
-            "max_retries": max_retries
-        })
-        raise RuntimeError(f"Max retries exceeded for {action} order {order_id}")
 
-    def __del__(self):
-        """Close session on cleanup."""
-        if hasattr(self, 'session'):
-            self.session.close()
\ No newline at end of file
+# Build the shared client at import (Lambda init) so warmup overlaps the cold start
+if settings.QUALIA_WARMUP:
+    get_qualia_client()
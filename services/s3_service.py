@@ -1,38 +1,74 @@
 # services/s3_service.py
 import boto3
-import json
+import gzip
 import hashlib
+import io
+import orjson
 import logging
+import time
+from boto3.s3.transfer import TransferConfig
+from config.aws import boto_config
 from config.settings import settings
-from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
-s3 = boto3.client('s3', region_name=settings.AWS_REGION)
+
+# Bodies at or above this size are uploaded as parallel multipart PUTs
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_transfer_config = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True
+)
+
+@lru_cache()
+def get_s3_client():
+    """Get the S3 client, creating it on first use."""
+    return boto3.client('s3', region_name=settings.AWS_REGION, config=boto_config)
 
 def upload_raw_payload(order_id: str, payload: dict):
-    """Upload raw order payload to S3 with checksum."""
-    now = datetime.utcnow()
-    key = f"orders/{now.year}/{now.month:02d}/{order_id}/raw.json"
-    body = json.dumps(payload).encode('utf-8')
-    checksum = hashlib.sha256(body).hexdigest()
+    """Upload raw order payload to S3 gzip-compressed, with a checksum of the JSON."""
+    now = time.gmtime()
+    key = f"orders/{now.tm_year}/{now.tm_mon:02d}/{order_id}/raw.json"
+    body = orjson.dumps(payload)
+    checksum = hashlib.sha256(body, usedforsecurity=False).hexdigest()
+    # Order JSON compresses well; readers check ContentEncoding and decompress
+    compressed = gzip.compress(body, compresslevel=6, mtime=0)
 
     try:
-        s3.put_object(
-            Bucket=settings.S3_BUCKET,
-            Key=key,
-            Body=body,
-            ContentType='application/json',
-            Metadata={'checksum': checksum}
-        )
-        logger.info(f"Uploaded order {order_id} to S3", extra={
+        extra_args = {
+            'ContentType': 'application/json',
+            'ContentEncoding': 'gzip',
+            'Metadata': {'checksum': checksum, 'uncompressed_size': str(len(body))},
+            # botocore computes the transfer checksum of the gzip bytes as it sends them
+            'ChecksumAlgorithm': 'SHA256'
+        }
+        if len(compressed) >= MULTIPART_THRESHOLD:
+            get_s3_client().upload_fileobj(
+                io.BytesIO(compressed),
+                settings.S3_BUCKET,
+                key,
+                ExtraArgs=extra_args,
+                Config=_transfer_config
+            )
+        else:
+            get_s3_client().put_object(
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                Body=compressed,
+                **extra_args
+            )
+        logger.info("Uploaded order %s to S3", order_id, extra={
             "order_id": order_id,
             "s3_key": key,
             "checksum": checksum,
-            "size_bytes": len(body)
+            "size_bytes": len(body),
+            "compressed_bytes": len(compressed)
         })
         return key, checksum
     except Exception as e:
-        logger.error(f"Failed to upload order {order_id} to S3: {str(e)}", extra={
+        logger.error("Failed to upload order %s to S3: %s", order_id, e, extra={
             "order_id": order_id,
             "s3_key": key,
             "error": str(e)
@@ -1,11 +1,24 @@
 # services/sqs_service.py
 import boto3
-import json
 import logging
+import orjson
+from config.aws import boto_config
 from config.settings import settings
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
-sqs = boto3.client('sqs', region_name=settings.AWS_REGION)
+
+@lru_cache()
+def get_sqs_client():
+    """Get the SQS client, creating it on first use."""
+    return boto3.client('sqs', region_name=settings.AWS_REGION, config=boto_config)
+
+# SendMessageBatch accepts at most 10 entries per call
+SQS_BATCH_SIZE = 10
+
+def _encode(message: dict) -> str:
+    """Compact JSON message body; SQS takes a str."""
+    return orjson.dumps(message).decode()
 
 def send_to_download_queue(order_id: str, notified_at: str):
     """Send order to download queue for processing."""
@@ -14,17 +27,17 @@ def send_to_download_queue(order_id: str, notified_at: str):
         "notified_at": notified_at
     }
     try:
-        response = sqs.send_message(
+        response = get_sqs_client().send_message(
             QueueUrl=settings.DOWNLOAD_QUEUE_URL,
-            MessageBody=json.dumps(message)
+            MessageBody=_encode(message)
         )
-        logger.info(f"Queued order {order_id} for download", extra={
+        logger.info("Queued order %s for download", order_id, extra={
             "order_id": order_id,
             "message_id": response.get("MessageId")
         })
         return response
     except Exception as e:
-        logger.error(f"Failed to queue order {order_id} for download: {str(e)}", extra={
+        logger.error("Failed to queue order %s for download: %s", order_id, e, extra={
             "order_id": order_id,
             "error": str(e)
         })
@@ -40,20 +53,72 @@ def send_to_processing_queue(order_id: str, s3_key: str, checksum: str = None):
         message["checksum"] = checksum
 
     try:
-        response = sqs.send_message(
+        response = get_sqs_client().send_message(
             QueueUrl=settings.PROCESSING_QUEUE_URL,
-            MessageBody=json.dumps(message)
+            MessageBody=_encode(message)
         )
-        logger.info(f"Queued order {order_id} for processing", extra={
+        logger.info("Queued order %s for processing", order_id, extra={
             "order_id": order_id,
             "s3_key": s3_key,
             "message_id": response.get("MessageId")
         })
         return response
     except Exception as e:
-        logger.error(f"Failed to queue order {order_id} for processing: {str(e)}", extra={
+        logger.error("Failed to queue order %s for processing: %s", order_id, e, extra={
             "order_id": order_id,
             "s3_key": s3_key,
             "error": str(e)
         })
-        raise
\ No newline at end of file
+        raise
+
+def send_batch_to_processing_queue(messages: list):
+    """Send downloaded orders to processing queue using SendMessageBatch.
+
+    Args:
+        messages: List of dicts with order_id, s3_key and optional checksum
+
+    Returns:
+        List of order IDs whose messages SQS failed to accept, including every
+        order in a chunk whose SendMessageBatch call raised
+    """
+    failed = []
+    for start in range(0, len(messages), SQS_BATCH_SIZE):
+        chunk = messages[start:start + SQS_BATCH_SIZE]
+        entries = []
+        for i, message in enumerate(chunk):
+            body = {
+                "order_id": message["order_id"],
+                "s3_key": message["s3_key"]
+            }
+            if message.get("checksum"):
+                body["checksum"] = message["checksum"]
+            entries.append({"Id": str(i), "MessageBody": _encode(body)})
+
+        try:
+            response = get_sqs_client().send_message_batch(
+                QueueUrl=settings.PROCESSING_QUEUE_URL,
+                Entries=entries
+            )
+        except Exception as e:
+            # Report this chunk as failed but keep going, so chunks already queued aren't redone
+            logger.error("Failed to queue batch of %s orders for processing: %s", len(chunk), e, extra={
+                "order_ids": [m["order_id"] for m in chunk],
+                "error": str(e)
+            })
+            failed.extend(m["order_id"] for m in chunk)
+            continue
+
+        for entry in response.get("Failed", []):
+            order_id = chunk[int(entry["Id"])]["order_id"]
+            logger.error("Failed to queue order %s for processing: %s", order_id, entry.get("Message"), extra={
+                "order_id": order_id,
+                "error": entry.get("Message"),
+                "error_code": entry.get("Code")
+            })
+            failed.append(order_id)
+
+        logger.info("Queued %s orders for processing", len(chunk) - len(response.get("Failed", [])), extra={
+            "order_ids": [m["order_id"] for m in chunk]
+        })
+
+    return failed
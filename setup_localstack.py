@@ -6,38 +6,60 @@ Creates DynamoDB tables, S3 buckets, and SQS queues for local development
 import boto3
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
+from functools import lru_cache
+from config.aws import boto_config
 
 # LocalStack configuration
 ENDPOINT_URL = "http://localhost:4566"
 REGION = "us-east-1"
 TABLE_NAME = "qualia-orders-dev"
 BUCKET_NAME = "qualia-orders-dev"
+QUEUE_NAMES = ("qualia-download-queue-dev", "qualia-processing-queue-dev")
+# Services that must report ready before resources are created
+REQUIRED_SERVICES = ("dynamodb", "s3", "sqs")
 
 # Set dummy credentials for LocalStack
 os.environ['AWS_ACCESS_KEY_ID'] = 'test'
 os.environ['AWS_SECRET_ACCESS_KEY'] = 'test'
 
-def check_localstack():
-    """Check if LocalStack is running."""
+@lru_cache()
+def get_client(service: str):
+    """Get a LocalStack client for the service, created once and reused."""
+    return boto3.client(service, region_name=REGION, endpoint_url=ENDPOINT_URL, config=boto_config)
+
+def check_localstack(attempts: int = 15):
+    """Check if LocalStack is running, waiting for it to finish booting."""
+    import json
+    import time
     import urllib.request
-    try:
-        urllib.request.urlopen(f"{ENDPOINT_URL}/_localstack/health", timeout=2)
-        print("✓ LocalStack is running")
-        return True
-    except Exception:
-        print("✗ LocalStack is not running!")
-        print("\nPlease start LocalStack first:")
-        print("  docker run -d --name localstack -p 4566:4566 localstack/localstack")
-        print("\nOr if already created:")
-        print("  docker start localstack")
-        return False
+    for attempt in range(attempts):
+        try:
+            with urllib.request.urlopen(f"{ENDPOINT_URL}/_localstack/health", timeout=2) as resp:
+                services = json.load(resp).get("services", {})
+            if all(services.get(name) in ("available", "running") for name in REQUIRED_SERVICES):
+                print("✓ LocalStack is running")
+                return True
+        except Exception:
+            pass
+        if attempt == 0:
+            print("… Waiting for LocalStack to become ready")
+        if attempt < attempts - 1:
+            time.sleep(min(0.5 * 1.5 ** attempt, 5))
+
+    print("✗ LocalStack is not running!")
+    print("\nPlease start LocalStack first:")
+    print("  docker run -d --name localstack -p 4566:4566 localstack/localstack")
+    print("\nOr if already created:")
+    print("  docker start localstack")
+    return False
 
 def create_dynamodb_table():
     """Create DynamoDB table for orders."""
     print(f"\nCreating DynamoDB Table: {TABLE_NAME}")
 
-    dynamodb = boto3.client('dynamodb', region_name=REGION, endpoint_url=ENDPOINT_URL)
+    dynamodb = get_client('dynamodb')
 
     try:
         dynamodb.create_table(
@@ -66,7 +88,7 @@ def create_s3_bucket():
     """Create S3 bucket for files."""
     print(f"\nCreating S3 Bucket: {BUCKET_NAME}")
 
-    s3 = boto3.client('s3', region_name=REGION, endpoint_url=ENDPOINT_URL)
+    s3 = get_client('s3')
 
     try:
         s3.create_bucket(Bucket=BUCKET_NAME)
@@ -84,26 +106,28 @@ def create_sqs_queues():
     """Create SQS queues for processing."""
     print("\nCreating SQS Queues...")
 
-    sqs = boto3.client('sqs', region_name=REGION, endpoint_url=ENDPOINT_URL)
+    sqs = get_client('sqs')
 
-    queues = [
-        'qualia-download-queue-dev',
-        'qualia-processing-queue-dev'
-    ]
-
-    success = True
-    for queue_name in queues:
+    def create_queue(queue_name):
         try:
             sqs.create_queue(QueueName=queue_name)
             print(f"✓ Queue '{queue_name}' created successfully")
+            return True
         except ClientError as e:
             if 'QueueAlreadyExists' in str(e):
                 print(f"⚠ Queue '{queue_name}' already exists")
-            else:
-                print(f"✗ Error creating queue '{queue_name}': {e}")
-                success = False
+                return True
+            print(f"✗ Error creating queue '{queue_name}': {e}")
+            return False
 
-    return success
+    with ThreadPoolExecutor(max_workers=len(QUEUE_NAMES)) as executor:
+        return all(list(executor.map(create_queue, QUEUE_NAMES)))
+
+def _print_names(names):
+    """Print a bulleted list with a single write."""
+    lines = [f"  - {name}" for name in names]
+    if lines:
+        print("\n".join(lines))
 
 def verify_resources():
     """Verify all resources were created."""
@@ -111,37 +135,36 @@ def verify_resources():
     print("Verifying Resources...")
     print("="*50)
 
-    # Check DynamoDB
+    # Check only the resources we created instead of listing everything
     print("\nDynamoDB Tables:")
-    dynamodb = boto3.client('dynamodb', region_name=REGION, endpoint_url=ENDPOINT_URL)
+    dynamodb = get_client('dynamodb')
     try:
-        response = dynamodb.list_tables()
-        for table in response['TableNames']:
-            print(f"  - {table}")
+        dynamodb.get_waiter('table_exists').wait(
+            TableName=TABLE_NAME,
+            WaiterConfig={'Delay': 1, 'MaxAttempts': 5}
+        )
+        _print_names([TABLE_NAME])
     except Exception as e:
-        print(f"  ✗ Error listing tables: {e}")
+        print(f"  ✗ Error checking table '{TABLE_NAME}': {e}")
 
-    # Check S3
     print("\nS3 Buckets:")
-    s3 = boto3.client('s3', region_name=REGION, endpoint_url=ENDPOINT_URL)
+    s3 = get_client('s3')
     try:
-        response = s3.list_buckets()
-        for bucket in response['Buckets']:
-            print(f"  - {bucket['Name']}")
+        s3.head_bucket(Bucket=BUCKET_NAME)
+        _print_names([BUCKET_NAME])
     except Exception as e:
-        print(f"  ✗ Error listing buckets: {e}")
+        print(f"  ✗ Error checking bucket '{BUCKET_NAME}': {e}")
 
-    # Check SQS
     print("\nSQS Queues:")
-    sqs = boto3.client('sqs', region_name=REGION, endpoint_url=ENDPOINT_URL)
-    try:
-        response = sqs.list_queues()
-        if 'QueueUrls' in response:
-            for queue_url in response['QueueUrls']:
-                queue_name = queue_url.split('/')[-1]
-                print(f"  - {queue_name}")
-    except Exception as e:
-        print(f"  ✗ Error listing queues: {e}")
+    sqs = get_client('sqs')
+    found = []
+    for queue_name in QUEUE_NAMES:
+        try:
+            sqs.get_queue_url(QueueName=queue_name)
+            found.append(queue_name)
+        except Exception as e:
+            print(f"  ✗ Error checking queue '{queue_name}': {e}")
+    _print_names(found)
 
 def main():
     """Main setup function."""
@@ -153,11 +176,13 @@ def main():
     if not check_localstack():
         sys.exit(1)
 
-    # Create resources
-    results = []
-    results.append(create_dynamodb_table())
-    results.append(create_s3_bucket())
-    results.append(create_sqs_queues())
+    # Build clients up front: boto3's default session isn't safe to create clients from concurrently
+    for service in ('dynamodb', 's3', 'sqs'):
+        get_client(service)
+
+    # Create resources; each is an independent round trip, so run them in parallel
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda create: create(), [create_dynamodb_table, create_s3_bucket, create_sqs_queues]))
 
     # Verify resources
     verify_resources()
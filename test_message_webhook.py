@@ -5,8 +5,10 @@ Test script for message webhook endpoint.
 This script demonstrates how to send test requests to the message webhook endpoint.
 """
 import requests
-import json
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+import os
+import orjson
+from utils.timeutils import now_iso
 
 # Configuration
 BASE_URL = "http://localhost:8000"
@@ -16,15 +18,29 @@ GET_MESSAGES_ENDPOINT = f"{BASE_URL}/webhook/messages"
 # Webhook credentials (should match your .env settings)
 AUTH = ("webhook_user", "webhook_pass")  # Update with your actual credentials
 
+# One session for the whole run so requests reuse the pooled connection
+SESSION = requests.Session()
+SESSION.auth = AUTH
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+SESSION.headers["Content-Type"] = "application/json"
+
+# Set VERBOSE=0 to skip pretty-printing payloads and responses (e.g. for repeated load runs)
+VERBOSE = os.getenv("VERBOSE", "1") != "0"
+
+def _pretty(obj):
+    """Indented JSON for display."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
 def test_message_received_webhook():
     """Test webhook for received message."""
+    now = now_iso()
     payload = {
         "order_id": "QO-123456",
         "message_id": "MSG-001",
         "order_number": "ORD-2025-001",
         "from_name": "John Smith",
         "text": "Hello, I have a question about this order.",
-        "created_date": datetime.utcnow().isoformat() + "Z",
+        "created_date": now,
         "read": False,
         "attachments": [
             {
@@ -35,24 +51,25 @@ def test_message_received_webhook():
             }
         ],
         "message_type": "message.received",
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": now
     }
 
     print(f"\n{'='*60}")
     print("Testing MESSAGE RECEIVED webhook...")
     print(f"{'='*60}")
-    print(f"\nPayload:\n{json.dumps(payload, indent=2)}")
+    if VERBOSE:
+        print(f"\nPayload:\n{_pretty(payload)}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             WEBHOOK_ENDPOINT,
-            json=payload,
-            auth=AUTH,
+            data=orjson.dumps(payload),
             timeout=10
         )
 
         print(f"\nResponse Status: {response.status_code}")
-        print(f"Response Body:\n{json.dumps(response.json(), indent=2)}")
+        if VERBOSE:
+            print(f"Response Body:\n{_pretty(orjson.loads(response.content))}")
 
         if response.status_code == 200:
             print("\n✓ Message received webhook processed successfully!")
@@ -64,34 +81,36 @@ def test_message_received_webhook():
 
 def test_message_sent_webhook():
     """Test webhook for sent message."""
+    now = now_iso()
     payload = {
         "order_id": "QO-123456",
         "message_id": "MSG-002",
         "order_number": "ORD-2025-001",
         "from_name": "Support Team",
         "text": "Thank you for your message. We will review your order and get back to you shortly.",
-        "created_date": datetime.utcnow().isoformat() + "Z",
+        "created_date": now,
         "read": False,
         "attachments": [],
         "message_type": "message.sent",
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": now
     }
 
     print(f"\n{'='*60}")
     print("Testing MESSAGE SENT webhook...")
     print(f"{'='*60}")
-    print(f"\nPayload:\n{json.dumps(payload, indent=2)}")
+    if VERBOSE:
+        print(f"\nPayload:\n{_pretty(payload)}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             WEBHOOK_ENDPOINT,
-            json=payload,
-            auth=AUTH,
+            data=orjson.dumps(payload),
             timeout=10
         )
 
         print(f"\nResponse Status: {response.status_code}")
-        print(f"Response Body:\n{json.dumps(response.json(), indent=2)}")
+        if VERBOSE:
+            print(f"Response Body:\n{_pretty(orjson.loads(response.content))}")
 
         if response.status_code == 200:
             print("\n✓ Message sent webhook processed successfully!")
@@ -115,15 +134,15 @@ def test_get_messages(order_id="QO-123456", message_type=None):
     print(f"{'='*60}")
 
     try:
-        response = requests.get(
+        response = SESSION.get(
             endpoint,
             params=params,
-            auth=AUTH,
             timeout=10
         )
 
         print(f"\nResponse Status: {response.status_code}")
-        print(f"Response Body:\n{json.dumps(response.json(), indent=2)}")
+        if VERBOSE:
+            print(f"Response Body:\n{_pretty(orjson.loads(response.content))}")
 
         if response.status_code == 200:
             print("\n✓ Messages retrieved successfully!")
@@ -12,7 +12,10 @@ This script tests all activity types that Qualia sends via webhook:
 - documents
 """
 import requests
-import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import os
+import orjson
 
 # Configuration
 BASE_URL = "http://localhost:8000"
@@ -21,24 +24,74 @@ WEBHOOK_ENDPOINT = f"{BASE_URL}/webhook/activity"
 # Webhook credentials (should match your .env settings)
 AUTH = ("webhook_user", "webhook_pass")  # Update with your actual credentials
 
-def test_activity(activity_type, payload, description):
+# One session for the whole run so requests reuse the pooled connection
+SESSION = requests.Session()
+SESSION.auth = AUTH
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+SESSION.headers["Content-Type"] = "application/json"
+
+# Set VERBOSE=0 to skip pretty-printing payloads and responses (e.g. for repeated load runs)
+VERBOSE = os.getenv("VERBOSE", "1") != "0"
+
+def _pretty(obj):
+    """Indented JSON for display."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+# Activity payloads are static, so serialize them once at import
+ACTIVITY_PAYLOADS = {
+    "order_request": {
+        "description": "You've received an order for a Title Search Plus in San Francisco County, California.",
+        "type": "order_request",
+        "order_id": "bK8bg5tajNkDpDk25"
+    },
+    "order_cancelled": {
+        "description": "Boston Legal has cancelled order #TEST-2018-1.",
+        "type": "order_cancelled",
+        "order_id": "bK8bg5tajNkDpDk25"
+    },
+    "order_completed": {
+        "description": "Boston Legal has accepted order #TEST-2018-1.",
+        "type": "order_completed",
+        "order_id": "bK8bg5tajNkDpDk25"
+    },
+    "order_revision_requested": {
+        "description": "Boston Legal has requested a change on order #TEST-2018-1.",
+        "type": "order_revision_requested",
+        "order_id": "bK8bg5tajNkDpDk25"
+    },
+    "message": {
+        "description": "Marty McFly sent you a message.",
+        "type": "message",
+        "order_id": "bK8bg5tajNkDpDk25",
+        "message_id": "LEPAjMB43myH8aGcP"
+    },
+    "documents": {
+        "description": "Boston Legal has sent you additional documents on order #TEST-2018-1",
+        "type": "documents",
+        "order_id": "bK8bg5tajNkDpDk25"
+    }
+}
+_ACTIVITY_BODIES = {name: orjson.dumps(payload) for name, payload in ACTIVITY_PAYLOADS.items()}
+
+def test_activity(activity_type, description):
     """Test a specific activity type."""
     print(f"\n{'='*70}")
     print(f"Testing: {description}")
     print(f"Activity Type: {activity_type}")
     print(f"{'='*70}")
-    print(f"\nPayload:\n{json.dumps(payload, indent=2)}")
+    if VERBOSE:
+        print(f"\nPayload:\n{_pretty(ACTIVITY_PAYLOADS[activity_type])}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             WEBHOOK_ENDPOINT,
-            json=payload,
-            auth=AUTH,
+            data=_ACTIVITY_BODIES[activity_type],
             timeout=10
         )
 
         print(f"\nResponse Status: {response.status_code}")
-        print(f"Response Body:\n{json.dumps(response.json(), indent=2)}")
+        if VERBOSE:
+            print(f"Response Body:\n{_pretty(orjson.loads(response.content))}")
 
         if response.status_code == 200:
             print(f"\n✓ {activity_type} webhook processed successfully!")
@@ -53,58 +106,27 @@ def test_activity(activity_type, payload, description):
 
 def test_order_request():
     """Test order_request activity (new order received)."""
-    payload = {
-        "description": "You've received an order for a Title Search Plus in San Francisco County, California.",
-        "type": "order_request",
-        "order_id": "bK8bg5tajNkDpDk25"
-    }
-    return test_activity("order_request", payload, "New Order Request")
+    return test_activity("order_request", "New Order Request")
 
 def test_order_cancelled():
     """Test order_cancelled activity."""
-    payload = {
-        "description": "Boston Legal has cancelled order #TEST-2018-1.",
-        "type": "order_cancelled",
-        "order_id": "bK8bg5tajNkDpDk25"
-    }
-    return test_activity("order_cancelled", payload, "Order Cancelled")
+    return test_activity("order_cancelled", "Order Cancelled")
 
 def test_order_completed():
     """Test order_completed activity."""
-    payload = {
-        "description": "Boston Legal has accepted order #TEST-2018-1.",
-        "type": "order_completed",
-        "order_id": "bK8bg5tajNkDpDk25"
-    }
-    return test_activity("order_completed", payload, "Order Completed")
+    return test_activity("order_completed", "Order Completed")
 
 def test_order_revision_requested():
     """Test order_revision_requested activity."""
-    payload = {
-        "description": "Boston Legal has requested a change on order #TEST-2018-1.",
-        "type": "order_revision_requested",
-        "order_id": "bK8bg5tajNkDpDk25"
-    }
-    return test_activity("order_revision_requested", payload, "Order Revision Requested")
+    return test_activity("order_revision_requested", "Order Revision Requested")
 
 def test_message():
     """Test message activity."""
-    payload = {
-        "description": "Marty McFly sent you a message.",
-        "type": "message",
-        "order_id": "bK8bg5tajNkDpDk25",
-        "message_id": "LEPAjMB43myH8aGcP"
-    }
-    return test_activity("message", payload, "Message Received")
+    return test_activity("message", "Message Received")
 
 def test_documents():
     """Test documents activity."""
-    payload = {
-        "description": "Boston Legal has sent you additional documents on order #TEST-2018-1",
-        "type": "documents",
-        "order_id": "bK8bg5tajNkDpDk25"
-    }
-    return test_activity("documents", payload, "Documents Added")
+    return test_activity("documents", "Documents Added")
 
 def test_validation_errors():
     """Test validation error handling."""
@@ -146,25 +168,25 @@ def test_validation_errors():
         }
     ]
 
-    results = []
-    for test_case in invalid_payloads:
-        print(f"\n  Test: {test_case['name']}")
+    def check_rejected(test_case):
         try:
-            response = requests.post(
+            response = SESSION.post(
                 WEBHOOK_ENDPOINT,
-                json=test_case['payload'],
-                auth=AUTH,
+                data=orjson.dumps(test_case['payload']),
                 timeout=10
             )
             if response.status_code in [400, 422]:
-                print(f"  ✓ Correctly rejected with status {response.status_code}")
-                results.append(True)
-            else:
-                print(f"  ✗ Unexpected status {response.status_code}")
-                results.append(False)
+                print(f"  ✓ {test_case['name']}: correctly rejected with status {response.status_code}")
+                return True
+            print(f"  ✗ {test_case['name']}: unexpected status {response.status_code}")
+            return False
         except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
-            results.append(False)
+            print(f"  ✗ {test_case['name']}: error: {str(e)}")
+            return False
+
+    # Cases are independent, so post them concurrently over the shared session
+    with ThreadPoolExecutor(max_workers=len(invalid_payloads)) as executor:
+        results = list(executor.map(check_rejected, invalid_payloads))
 
     return all(results)
 
@@ -176,19 +198,23 @@ def main():
     print("Make sure your FastAPI server is running!")
     print("Update AUTH credentials to match your .env settings")
 
-    results = []
+    activity_tests = [
+        ("Order Request", test_order_request),
+        ("Order Cancelled", test_order_cancelled),
+        ("Order Completed", test_order_completed),
+        ("Order Revision Requested", test_order_revision_requested),
+        ("Message", test_message),
+        ("Documents", test_documents),
+    ]
 
-    # Test all activity types
+    # Test all activity types; each is an independent POST, so run them concurrently
     print("\n" + "="*70)
     print("PART 1: Testing All Activity Types")
     print("="*70)
 
-    results.append(("Order Request", test_order_request()))
-    results.append(("Order Cancelled", test_order_cancelled()))
-    results.append(("Order Completed", test_order_completed()))
-    results.append(("Order Revision Requested", test_order_revision_requested()))
-    results.append(("Message", test_message()))
-    results.append(("Documents", test_documents()))
+    with ThreadPoolExecutor(max_workers=len(activity_tests)) as executor:
+        outcomes = list(executor.map(lambda test: test[1](), activity_tests))
+    results = [(name, outcome) for (name, _), outcome in zip(activity_tests, outcomes)]
 
     # Test validation
     print("\n" + "="*70)
@@ -5,28 +5,33 @@ from unittest.mock import Mock, MagicMock
 import boto3
 from moto import mock_dynamodb, mock_s3, mock_sqs
 
+# One botocore session for all moto fixtures instead of one per boto3.client/resource call
+_SESSION = boto3.session.Session(region_name='us-east-1')
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env():
     """Set up test environment variables."""
-    os.environ["STAGE"] = "test"
-    os.environ["AWS_REGION"] = "us-east-1"
-    os.environ["WEBHOOK_USERNAME"] = "test_user"
-    os.environ["WEBHOOK_PASSWORD"] = "test_pass"
-    os.environ["QUALIA_API_TOKEN"] = "test_token_123"
-    os.environ["INTERNAL_API_TOKEN"] = "internal_token_123"
-    os.environ["INTERNAL_API_URL"] = "https://internal-api.example.com/orders"
-    os.environ["S3_BUCKET"] = "qualia-orders-test"
-    os.environ["DYNAMODB_TABLE"] = "qualia-orders-test"
-    os.environ["DOWNLOAD_QUEUE_URL"] = "https://sqs.us-east-1.amazonaws.com/123456789/download-queue-test"
-    os.environ["PROCESSING_QUEUE_URL"] = "https://sqs.us-east-1.amazonaws.com/123456789/processing-queue-test"
-
-
-@pytest.fixture
-def mock_dynamodb_table():
-    """Mock DynamoDB table for testing."""
+    os.environ.update({
+        "STAGE": "test",
+        "AWS_REGION": "us-east-1",
+        "WEBHOOK_USERNAME": "test_user",
+        "WEBHOOK_PASSWORD": "test_pass",
+        "QUALIA_API_TOKEN": "test_token_123",
+        "INTERNAL_API_TOKEN": "internal_token_123",
+        "INTERNAL_API_URL": "https://internal-api.example.com/orders",
+        "S3_BUCKET": "qualia-orders-test",
+        "DYNAMODB_TABLE": "qualia-orders-test",
+        "DOWNLOAD_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/123456789/download-queue-test",
+        "PROCESSING_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/123456789/processing-queue-test"
+    })
+
+
+@pytest.fixture(scope="session")
+def _moto_dynamodb_table():
+    """Start moto DynamoDB and create the table once per test session."""
     with mock_dynamodb():
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        dynamodb = _SESSION.resource('dynamodb')
         table = dynamodb.create_table(
             TableName='qualia-orders-test',
             KeySchema=[{'AttributeName': 'orderId', 'KeyType': 'HASH'}],
@@ -37,27 +42,68 @@ def mock_dynamodb_table():
 
 
 @pytest.fixture
-def mock_s3_bucket():
-    """Mock S3 bucket for testing."""
+def mock_dynamodb_table(_moto_dynamodb_table):
+    """Mock DynamoDB table for testing, emptied after each test."""
+    yield _moto_dynamodb_table
+    scan = _moto_dynamodb_table.scan(ProjectionExpression='orderId')
+    with _moto_dynamodb_table.batch_writer() as batch:
+        for item in scan['Items']:
+            batch.delete_item(Key={'orderId': item['orderId']})
+
+
+@pytest.fixture
+def dynamo_seed(mock_dynamodb_table):
+    """Seed the mock table; batch_writer sends up to 25 items per BatchWriteItem call."""
+    def _seed(items):
+        with mock_dynamodb_table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+    return _seed
+
+
+@pytest.fixture(scope="session")
+def _moto_s3_bucket():
+    """Start moto S3 and create the bucket once per test session."""
     with mock_s3():
-        s3 = boto3.client('s3', region_name='us-east-1')
+        s3 = _SESSION.client('s3')
         s3.create_bucket(Bucket='qualia-orders-test')
         yield s3
 
 
 @pytest.fixture
-def mock_sqs_queues():
-    """Mock SQS queues for testing."""
+def mock_s3_bucket(_moto_s3_bucket):
+    """Mock S3 bucket for testing, emptied after each test."""
+    yield _moto_s3_bucket
+    objects = _moto_s3_bucket.list_objects_v2(Bucket='qualia-orders-test').get('Contents', [])
+    if objects:
+        _moto_s3_bucket.delete_objects(
+            Bucket='qualia-orders-test',
+            Delete={'Objects': [{'Key': obj['Key']} for obj in objects]}
+        )
+
+
+@pytest.fixture(scope="session")
+def _moto_sqs_queues():
+    """Start moto SQS and create the queues once per test session."""
     with mock_sqs():
-        sqs = boto3.client('sqs', region_name='us-east-1')
+        sqs = _SESSION.client('sqs')
         download_queue = sqs.create_queue(QueueName='download-queue-test')
         processing_queue = sqs.create_queue(QueueName='processing-queue-test')
-        yield {
+        yield sqs, {
             'download': download_queue['QueueUrl'],
             'processing': processing_queue['QueueUrl']
         }
 
 
+@pytest.fixture
+def mock_sqs_queues(_moto_sqs_queues):
+    """Mock SQS queues for testing, purged after each test."""
+    sqs, queues = _moto_sqs_queues
+    yield queues
+    for queue_url in queues.values():
+        sqs.purge_queue(QueueUrl=queue_url)
+
+
 @pytest.fixture
 def sample_webhook_payload():
     """Sample webhook notification payload."""
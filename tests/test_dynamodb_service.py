@@ -0,0 +1,81 @@
+# tests/test_dynamodb_service.py
+import pytest
+from unittest.mock import patch
+from services import dynamodb_service
+
+
+@pytest.fixture(autouse=True)
+def clear_message_cache():
+    """Start each test with an empty message cache."""
+    dynamodb_service._message_cache.clear()
+    yield
+    dynamodb_service._message_cache.clear()
+
+
+class TestMessageCache:
+    """Tests for the get_messages_by_order cache."""
+
+    def test_repeated_lookup_served_from_cache(self):
+        """Test a second lookup for the same order does not query DynamoDB."""
+        with patch('services.dynamodb_service.get_table') as mock_table:
+            mock_table.return_value.query.return_value = {"Items": [{"messageId": "m1"}]}
+
+            first = dynamodb_service.get_messages_by_order("QO-1")
+            second = dynamodb_service.get_messages_by_order("QO-1")
+
+            assert first == second == [{"messageId": "m1"}]
+            assert mock_table.return_value.query.call_count == 1
+
+    def test_store_message_invalidates_order(self):
+        """Test storing a message forces the next lookup to query DynamoDB."""
+        message = {
+            "order_id": "QO-1",
+            "message_id": "m2",
+            "message_type": "message.received",
+            "from_name": "Jane",
+            "text": "hello",
+            "created_date": "2025-10-28T10:30:00Z"
+        }
+
+        with patch('services.dynamodb_service.get_table') as mock_table:
+            mock_table.return_value.query.return_value = {"Items": []}
+
+            dynamodb_service.get_messages_by_order("QO-1")
+            dynamodb_service.store_message(message)
+            dynamodb_service.get_messages_by_order("QO-1")
+
+            assert mock_table.return_value.query.call_count == 2
+
+
+class TestPutMetadata:
+    """Tests for order metadata writes."""
+
+    def test_notified_does_not_overwrite_later_status(self, mock_dynamodb_table):
+        """Test an if_absent NOTIFIED write leaves an existing order untouched."""
+        mock_dynamodb_table.put_item(Item={"orderId": "QO-1", "status": "DOWNLOADED"})
+
+        with patch('services.dynamodb_service.get_table', return_value=mock_dynamodb_table):
+            dynamodb_service.put_metadata("QO-1", "NOTIFIED", if_absent=True)
+
+        assert mock_dynamodb_table.get_item(Key={"orderId": "QO-1"})["Item"]["status"] == "DOWNLOADED"
+
+    def test_repeated_failure_records_latest_error(self, mock_dynamodb_table):
+        """Test a second FAILED write replaces the first failure's details."""
+        with patch('services.dynamodb_service.get_table', return_value=mock_dynamodb_table):
+            dynamodb_service.put_metadata("QO-1", "FAILED", {"error": "first"})
+            dynamodb_service.put_metadata("QO-1", "FAILED", {"error": "second"})
+
+        assert mock_dynamodb_table.get_item(Key={"orderId": "QO-1"})["Item"]["error"] == "second"
+
+    def test_batch_update_overwrites_seeded_orders(self, mock_dynamodb_table, dynamo_seed):
+        """Test batch_put_metadata moves every existing order to the new status."""
+        dynamo_seed([{"orderId": f"QO-{i}", "status": "NOTIFIED"} for i in range(30)])
+
+        with patch('services.dynamodb_service.get_table', return_value=mock_dynamodb_table):
+            dynamodb_service.batch_put_metadata([
+                {"order_id": f"QO-{i}", "status": "DOWNLOADED"} for i in range(30)
+            ])
+
+        items = mock_dynamodb_table.scan()["Items"]
+        assert len(items) == 30
+        assert {item["status"] for item in items} == {"DOWNLOADED"}
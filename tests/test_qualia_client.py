@@ -0,0 +1,147 @@
+# tests/test_qualia_client.py
+import threading
+import time
+import orjson
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from services.qualia_client import QualiaClient
+
+
+def _response(status_code=200, data=None):
+    """Build a fake requests.Response carrying a GraphQL data payload."""
+    return MagicMock(status_code=status_code, content=orjson.dumps({"data": data or {}}))
+
+
+class TestReadCache:
+    """Tests for the get_order/get_orders response cache."""
+
+    def test_repeated_get_order_served_from_cache(self):
+        """Test a second get_order for the same order does not hit the API."""
+        with QualiaClient() as client, \
+             patch.object(client, '_post_graphql', return_value=_response(data={"order": {"id": "QO-1"}})) as mock_post:
+            first = client.get_order("QO-1")
+            second = client.get_order("QO-1")
+
+            assert first == second == {"order": {"id": "QO-1"}}
+            mock_post.assert_called_once()
+
+    def test_mutation_invalidates_order(self):
+        """Test a successful mutation forces the next get_order to hit the API."""
+        client = QualiaClient()
+
+        with patch.object(client, '_post_graphql', return_value=_response()) as mock_post:
+            client.get_order("QO-1")
+            client.accept_order("QO-1")
+            client.get_order("QO-1")
+
+            assert mock_post.call_count == 3
+
+
+class TestRetry:
+    """Tests for the shared retry helper."""
+
+    def test_rate_limit_honors_retry_after(self):
+        """Test a 429 waits at least as long as the Retry-After header asks."""
+        client = QualiaClient()
+        limited = MagicMock(status_code=429, text="slow down", headers={"Retry-After": "7"})
+
+        with patch.object(client, '_post_graphql', side_effect=[limited, _response(data={"ok": True})]), \
+             patch('services.qualia_client.time.sleep') as mock_sleep:
+            result = client.submit_order("QO-1")
+
+            assert result == {"ok": True}
+            assert mock_sleep.call_args[0][0] >= 7
+
+    def test_no_sleep_after_final_attempt(self):
+        """Test exhausting retries sleeps only between attempts."""
+        client = QualiaClient()
+        failing = MagicMock(status_code=500, text="boom", headers={})
+
+        with patch.object(client, '_post_graphql', return_value=failing), \
+             patch('services.qualia_client.time.sleep') as mock_sleep:
+            with pytest.raises(RuntimeError, match="Max retries exceeded"):
+                client.get_order("QO-1", max_retries=3)
+
+            assert mock_sleep.call_count == 2
+
+    def test_backoff_keeps_exponential_floor(self):
+        """Test jitter only adds to the exponential wait, never shortens it."""
+        client = QualiaClient()
+        failing = MagicMock(status_code=500, text="boom", headers={})
+
+        with patch.object(client, '_post_graphql', return_value=failing), \
+             patch('services.qualia_client._rng.uniform', return_value=0.0), \
+             patch('services.qualia_client.time.sleep') as mock_sleep:
+            with pytest.raises(RuntimeError, match="Max retries exceeded"):
+                client.get_order("QO-1", max_retries=4)
+
+            assert [c[0][0] for c in mock_sleep.call_args_list] == [1, 2, 4]
+
+
+class TestGetReads:
+    """Tests for read queries sent over GET."""
+
+    def test_not_modified_reuses_stored_body(self):
+        """Test a 304 revalidation returns the body stored with the ETag."""
+        client = QualiaClient()
+        client._get_reads = True
+        client._read_cache_ttl = 0
+        fresh = MagicMock(status_code=200, content=orjson.dumps({"data": {"order": {"id": "QO-1"}}}),
+                          headers={"ETag": '"v1"'})
+        not_modified = MagicMock(status_code=304, content=b"", headers={})
+
+        with patch.object(client.session, 'get', side_effect=[fresh, not_modified]) as mock_get:
+            client.get_order("QO-1")
+            result = client.get_order("QO-1")
+
+            assert result == {"order": {"id": "QO-1"}}
+            assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent duplicate requests."""
+
+    def test_concurrent_downloads_share_one_request(self):
+        """Test concurrent download_order calls for one order make a single HTTP request."""
+        client = QualiaClient()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(url, timeout):
+            started.set()
+            release.wait(5)
+            return MagicMock(status_code=200, content=orjson.dumps({"order_number": "QO-1"}))
+
+        with patch.object(client.session, 'get', side_effect=slow_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                first = pool.submit(client.download_order, "QO-1")
+                started.wait(5)
+                second = pool.submit(client.download_order, "QO-1")
+                time.sleep(0.05)
+                release.set()
+
+                assert first.result() == second.result() == {"order_number": "QO-1"}
+            mock_get.assert_called_once()
+
+    def test_concurrent_messages_list_misses_share_one_request(self):
+        """Test concurrent get_messages_list cache misses make a single HTTP request."""
+        client = QualiaClient()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_post(payload):
+            started.set()
+            release.wait(5)
+            return _response(data={"messages": []})
+
+        with patch.object(client, '_post_graphql', side_effect=slow_post) as mock_post:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                first = pool.submit(client.get_messages_list)
+                started.wait(5)
+                second = pool.submit(client.get_messages_list)
+                time.sleep(0.05)
+                release.set()
+
+                assert first.result() == second.result() == {"messages": []}
+            mock_post.assert_called_once()
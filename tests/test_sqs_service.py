@@ -0,0 +1,19 @@
+# tests/test_sqs_service.py
+from unittest.mock import patch
+from services.sqs_service import send_batch_to_processing_queue
+
+
+class TestSendBatchToProcessingQueue:
+    """Tests for batched processing-queue sends."""
+
+    def test_failed_chunk_reported_without_raising(self):
+        """Test a chunk whose SendMessageBatch call raises is returned as failed while other chunks still send."""
+        messages = [{"order_id": f"QO-{i}", "s3_key": f"orders/QO-{i}/raw.json"} for i in range(12)]
+
+        with patch('services.sqs_service.get_sqs_client') as mock_client:
+            mock_client.return_value.send_message_batch.side_effect = [{"Failed": []}, Exception("throttled")]
+
+            failed = send_batch_to_processing_queue(messages)
+
+            assert failed == ["QO-10", "QO-11"]
+            assert mock_client.return_value.send_message_batch.call_count == 2
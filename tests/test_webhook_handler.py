@@ -2,7 +2,9 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
+import orjson
 from main import app
+from services.qualia_client import QualiaClient
 
 
 client = TestClient(app)
@@ -168,3 +170,53 @@ class TestWebhookHandler:
         assert data["status"] == "healthy"
         assert data["service"] == "qualia-webhook-api"
         assert data["version"] == "1.0.0"
+
+
+class TestActivityWebhook:
+    """Tests for the activity webhook endpoint."""
+
+    def test_new_message_after_cached_list_is_refetched(self):
+        """Test a message missing from the cached messages list triggers one uncached refetch."""
+        qualia = QualiaClient()
+        listed = [
+            MagicMock(status_code=200, content=orjson.dumps({"data": {"messages": [{"message_id": "M1"}]}})),
+            MagicMock(status_code=200, content=orjson.dumps({"data": {"messages": [{"message_id": "M1"}, {"message_id": "M2", "text": "hi"}]}}))
+        ]
+
+        with patch('utils.auth._WEBHOOK_TOKEN', b"test_token"), \
+             patch('services.qualia_client.get_qualia_client', return_value=qualia), \
+             patch.object(qualia, '_post_graphql', side_effect=listed) as mock_post, \
+             patch('handlers.message_webhook_handler.store_activity_with_message') as mock_store:
+
+            for message_id in ("M1", "M2"):
+                response = client.post(
+                    "/webhook/activity",
+                    json={"description": "New message", "type": "message", "order_id": "QO-1", "message_id": message_id},
+                    headers={"Authorization": "Basic test_token"}
+                )
+                assert response.status_code == 200
+
+            assert mock_post.call_count == 2
+            assert mock_store.call_args[0][1]["message_id"] == "M2"
+            assert mock_store.call_args[0][1]["text"] == "hi"
+
+    def test_activity_invalidates_cached_order(self):
+        """Test an order activity forces the next get_order to hit the Qualia API."""
+        qualia = QualiaClient()
+        order = MagicMock(status_code=200, content=orjson.dumps({"data": {"order": {"id": "QO-1"}}}))
+
+        with patch('utils.auth._WEBHOOK_TOKEN', b"test_token"), \
+             patch('services.qualia_client.get_qualia_client', return_value=qualia), \
+             patch.object(qualia, '_post_graphql', return_value=order) as mock_post, \
+             patch('handlers.message_webhook_handler.store_activity'):
+
+            qualia.get_order("QO-1")
+            response = client.post(
+                "/webhook/activity",
+                json={"description": "Order cancelled", "type": "order_cancelled", "order_id": "QO-1"},
+                headers={"Authorization": "Basic test_token"}
+            )
+            qualia.get_order("QO-1")
+
+            assert response.status_code == 200
+            assert mock_post.call_count == 2
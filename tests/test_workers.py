@@ -0,0 +1,122 @@
+import gzip
+import json
+import orjson
+from unittest.mock import patch, MagicMock
+from handlers.download_worker import handle_download_event
+from handlers.processing_worker import handle_processing_event
+
+
+def _sqs_event(*bodies):
+    """Build an SQS Lambda event with one record per body."""
+    return {
+        "Records": [
+            {"messageId": f"msg-{i}", "body": json.dumps(body)}
+            for i, body in enumerate(bodies)
+        ]
+    }
+
+
+class TestDownloadWorker:
+    """Tests for download worker batch handling."""
+
+    def test_all_records_succeed(self):
+        """Test fully successful batch reports no failures."""
+        event = _sqs_event({"order_id": "QO-1"}, {"order_id": "QO-2"})
+
+        with patch('handlers.download_worker.get_qualia_client') as mock_client, \
+             patch('handlers.download_worker.upload_raw_payload', return_value=("key", "sum")), \
+             patch('handlers.download_worker.batch_put_metadata'), \
+             patch('handlers.download_worker.send_batch_to_processing_queue', return_value=[]) as mock_send:
+
+            mock_client.return_value.download_order.return_value = {"order_number": "QO-1"}
+            result = handle_download_event(event)
+
+            assert result == {"batchItemFailures": []}
+            mock_send.assert_called_once()
+            assert sorted(m["order_id"] for m in mock_send.call_args[0][0]) == ["QO-1", "QO-2"]
+
+    def test_failed_record_reported(self):
+        """Test only the failing record is reported for retry."""
+        event = _sqs_event({"order_id": "QO-1"}, {"order_id": "QO-2"})
+
+        with patch('handlers.download_worker.get_qualia_client') as mock_client, \
+             patch('handlers.download_worker.upload_raw_payload', return_value=("key", "sum")), \
+             patch('handlers.download_worker.batch_put_metadata'), \
+             patch('handlers.download_worker.send_batch_to_processing_queue', return_value=[]) as mock_send:
+
+            def download(order_id):
+                if order_id == "QO-1":
+                    raise RuntimeError("boom")
+                return {"order_number": order_id}
+
+            mock_client.return_value.download_order.side_effect = download
+            result = handle_download_event(event)
+
+            assert result == {"batchItemFailures": [{"itemIdentifier": "msg-0"}]}
+            assert [m["order_id"] for m in mock_send.call_args[0][0]] == ["QO-2"]
+
+    def test_failed_queue_entry_reported(self):
+        """Test records rejected by SendMessageBatch are reported for retry."""
+        event = _sqs_event({"order_id": "QO-1"}, {"order_id": "QO-2"})
+
+        with patch('handlers.download_worker.get_qualia_client'), \
+             patch('handlers.download_worker.upload_raw_payload', return_value=("key", "sum")), \
+             patch('handlers.download_worker.batch_put_metadata'), \
+             patch('handlers.download_worker.send_batch_to_processing_queue', return_value=["QO-2"]):
+
+            result = handle_download_event(event)
+
+            assert result == {"batchItemFailures": [{"itemIdentifier": "msg-1"}]}
+
+
+class TestProcessingWorker:
+    """Tests for processing worker batch handling."""
+
+    def test_failed_record_reported(self):
+        """Test a rejected order is marked FAILED and reported for retry."""
+        event = _sqs_event(
+            {"order_id": "QO-1", "s3_key": "orders/QO-1/raw.json"},
+            {"order_id": "QO-2", "s3_key": "orders/QO-2/raw.json"}
+        )
+
+        def get_object(Bucket, Key):
+            body = MagicMock()
+            order_id = Key.split("/")[1]
+            body.read.return_value = json.dumps({"order_number": order_id, "vertical": "title"}).encode('utf-8')
+            return {"Body": body}
+
+        def post(url, data, **kwargs):
+            if orjson.loads(data)["externalOrderId"] == "QO-2":
+                return MagicMock(status_code=400, text="bad")
+            return MagicMock(status_code=200, text="ok")
+
+        with patch('handlers.processing_worker.get_s3_client') as mock_s3, \
+             patch('handlers.processing_worker._session.post', side_effect=post), \
+             patch('handlers.processing_worker.put_metadata') as mock_db, \
+             patch('handlers.processing_worker.batch_put_metadata') as mock_batch_db:
+
+            mock_s3.return_value.get_object.side_effect = get_object
+            result = handle_processing_event(event)
+
+            assert result == {"batchItemFailures": [{"itemIdentifier": "msg-1"}]}
+            mock_db.assert_called_once()
+            assert mock_db.call_args[0][:2] == ("QO-2", "FAILED")
+            updates = mock_batch_db.call_args[0][0]
+            assert [(u["order_id"], u["status"]) for u in updates] == [("QO-1", "PROCESSED")]
+
+    def test_gzip_payload_decompressed(self):
+        """Test a gzip-encoded raw payload is decompressed before transformation."""
+        event = _sqs_event({"order_id": "QO-1", "s3_key": "orders/QO-1/raw.json"})
+        body = MagicMock()
+        body.read.return_value = gzip.compress(json.dumps({"order_number": "QO-1", "vertical": "title"}).encode('utf-8'))
+
+        with patch('handlers.processing_worker.get_s3_client') as mock_s3, \
+             patch('handlers.processing_worker._session.post', return_value=MagicMock(status_code=200, text="ok")) as mock_post, \
+             patch('handlers.processing_worker.put_metadata'), \
+             patch('handlers.processing_worker.batch_put_metadata'):
+
+            mock_s3.return_value.get_object.return_value = {"Body": body, "ContentEncoding": "gzip"}
+            result = handle_processing_event(event)
+
+            assert result == {"batchItemFailures": []}
+            assert orjson.loads(mock_post.call_args.kwargs["data"])["externalOrderId"] == "QO-1"
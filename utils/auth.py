@@ -1,7 +1,12 @@
 # utils/auth.py
+import hmac
 from fastapi import HTTPException, status, Header
 from config.settings import settings
 
+# Expected webhook token as bytes, encoded once at import
+_WEBHOOK_TOKEN = settings.WEBHOOK_TOKEN.encode("utf-8")
+_BASIC_PREFIX = "Basic "
+
 def verify_webhook_auth(authorization: str = Header(None)):
     """
     Verify webhook authentication using Authorization header with Basic token format.
@@ -15,7 +20,7 @@ def verify_webhook_auth(authorization: str = Header(None)):
         )
 
     # Check if it starts with "Basic "
-    if not authorization.startswith("Basic "):
+    if not authorization.startswith(_BASIC_PREFIX):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Authorization header format. Expected: 'Basic <token>'",
@@ -23,12 +28,10 @@ def verify_webhook_auth(authorization: str = Header(None)):
         )
 
     # Extract the token
-    token = authorization[6:]  # Remove "Basic " prefix
-
-    # Compare with the expected token from settings
-    expected_token = settings.WEBHOOK_TOKEN
+    token = authorization[len(_BASIC_PREFIX):].encode("utf-8")
 
-    if token != expected_token:
+    # Constant-time compare so response timing doesn't leak the token
+    if not _WEBHOOK_TOKEN or not hmac.compare_digest(token, _WEBHOOK_TOKEN):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -1,10 +1,50 @@
 # utils/logger.py
+import atexit
+import copy
 import logging
-import json
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+import time
 from typing import Any, Dict
 
+import orjson
+
+# Optional fields passed via logger calls' extra={...}
+_EXTRA_FIELDS = ("order_id", "request_id", "s3_key", "status_code", "error")
+
+# Formatted tracebacks keyed by _exc_key(); FIFO-evicted past the cap
+_TB_CACHE_MAXSIZE = 256
+_tb_cache: Dict[tuple, str] = {}
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent record; replaced as a whole tuple
+_ts_cache = (0, "")
+
+
+def _timestamp(record: logging.LogRecord) -> str:
+    """ISO-8601 UTC timestamp for the record, reusing the formatted second."""
+    global _ts_cache
+    second = int(record.created)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{int(record.msecs):03d}Z"
+
+
+def _exc_key(exc: BaseException) -> tuple:
+    """Identify a traceback by exception type, message and raising locations, including chained exceptions."""
+    key = []
+    while exc is not None:
+        tb = exc.__traceback__
+        frames = []
+        while tb is not None:
+            frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+            tb = tb.tb_next
+        key.append((type(exc), str(exc), tuple(frames)))
+        exc = exc.__cause__ or (None if exc.__suppress_context__ else exc.__context__)
+    return tuple(key)
+
 
 class JsonFormatter(logging.Formatter):
     """JSON formatter for CloudWatch structured logging."""
@@ -12,43 +52,101 @@ class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
         # Add extra fields if present
-        if hasattr(record, "order_id"):
-            log_data["order_id"] = record.order_id
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-        if hasattr(record, "s3_key"):
-            log_data["s3_key"] = record.s3_key
-        if hasattr(record, "status_code"):
-            log_data["status_code"] = record.status_code
-        if hasattr(record, "error"):
-            log_data["error"] = record.error
-
-        # Add exception info if present
+        fields = record.__dict__
+        for name in _EXTRA_FIELDS:
+            if name in fields:
+                log_data[name] = fields[name]
+
+        # Add exception info if present; repeated identical tracebacks (e.g. during an outage) are formatted once
         if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self._format_exception_cached(record.exc_info)
+            log_data["exception"] = record.exc_text
+
+        return orjson.dumps(log_data, default=str).decode()
+
+    def _format_exception_cached(self, exc_info) -> str:
+        """formatException, memoized on the exception's _exc_key()."""
+        if exc_info[1] is None:
+            return self.formatException(exc_info)
+        key = _exc_key(exc_info[1])
+        text = _tb_cache.get(key)
+        if text is None:
+            text = self.formatException(exc_info)
+            if len(_tb_cache) >= _TB_CACHE_MAXSIZE:
+                _tb_cache.pop(next(iter(_tb_cache)), None)
+            _tb_cache[key] = text
+        return text
 
-        return json.dumps(log_data)
 
+class RequestLogger(logging.LoggerAdapter):
+    """Logger bound to one request's context fields (order_id, request_id, ...).
 
-def setup_logging(log_level: str = "INFO", use_json: bool = False) -> None:
+    The bound dict is reused as `extra` for every call; per-call extra keys
+    are merged over it only when given.
+    """
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get("extra")
+        kwargs["extra"] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process queue.
+
+    Records aren't pickled, so only the message is resolved here (args may be
+    mutated after the call); exc_info is kept for the formatter on the
+    listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background listener started by setup_logging(use_queue=True)
+_listener = None
+
+
+def _stop_listener() -> None:
+    """Stop the queue listener, writing out any records still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def setup_logging(log_level: str = "INFO", use_json: bool = False, use_queue: bool = False) -> None:
     """
     Configure application logging.
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         use_json: If True, use JSON formatter for structured logging
+        use_queue: If True, log calls only enqueue records and a background thread
+            formats and writes them. For long-running servers only: Lambda freezes
+            the process after each response, which would strand queued records.
     """
+    global _listener
+
     # Remove existing handlers
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_listener()
 
     # Create console handler
     handler = logging.StreamHandler(sys.stdout)
@@ -65,6 +163,11 @@ def setup_logging(log_level: str = "INFO", use_json: bool = False) -> None:
     handler.setFormatter(formatter)
 
     # Configure root logger
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _listener.start()
+        handler = _LocalQueueHandler(log_queue)
     root_logger.addHandler(handler)
     root_logger.setLevel(getattr(logging, log_level.upper()))
 
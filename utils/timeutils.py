@@ -0,0 +1,12 @@
+# utils/timeutils.py
+from datetime import datetime, timezone
+
+
+def now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with millisecond precision and Z suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def iso_from_ns(ns: int) -> str:
+    """Format a time.time_ns() value like now_iso()."""
+    return datetime.fromtimestamp(ns // 1_000 / 1_000_000, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
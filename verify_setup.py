@@ -66,13 +66,13 @@ def verify_routes():
     print("\nVerifying routes...")
     try:
         from main import app
-        routes = [route.path for route in app.routes]
+        routes = {route.path for route in app.routes}
 
-        if "/webhook/activity" in routes or any("/webhook/activity" in r for r in routes):
+        if "/webhook/activity" in routes:
             print("✓ Activity webhook route registered at /webhook/activity")
         else:
             print("✗ Activity webhook route NOT found")
-            print(f"Available routes: {routes}")
+            print(f"Available routes: {sorted(routes)}")
             return False
 
         return True